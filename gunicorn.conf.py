@@ -0,0 +1,22 @@
+import os
+import shutil
+import tempfile
+
+# The worker processes write their Prometheus metrics to files in this directory, which are aggregated by the /metrics
+# endpoint. It must be set before the workers import prometheus_client.
+os.environ.setdefault('prometheus_multiproc_dir', os.path.join(tempfile.gettempdir(), 'library-metrics'))
+
+
+def on_starting(server):
+    # The files of a previous run would be aggregated with the new ones
+    metrics_dir = os.environ['prometheus_multiproc_dir']
+
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    # Drop the requests in progress of the dead worker
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,285 @@
+"""
+Benchmarks of the API and of the import commands, run by the 'benchmark' management command against generated
+catalogs of several sizes.
+"""
+import csv
+import functools
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from library.models import Author, Book
+
+# Number of authors generated for each book of the catalog.
+AUTHORS_PER_BOOK_RATIO = 0.1
+
+# Number of books created by the bulk write benchmark.
+BULK_WRITE_SIZE = 100
+
+# Number of authors imported by the import_authors benchmark.
+IMPORT_AUTHORS_SIZE = 10000
+
+# Number of authors and books inserted by the primary key benchmarks, with random and with time-ordered ids.
+INSERT_IDS_SIZE = 10000
+ID_BENCHMARKS = [('insert.random_ids', False), ('insert.time_ordered_ids', True)]
+
+# Tables whose indexes are measured by the primary key benchmarks.
+CATALOG_TABLES = [Author._meta.db_table, Book._meta.db_table, Book.authors.through._meta.db_table]
+
+
+class BenchmarkRollback(Exception):
+    """
+    Raised to roll back the writes of a benchmark run.
+    """
+
+
+def run_benchmarks(sizes: List[int], repeat: int, seed: int = 0, log: Callable[[str], None] = print) -> List[Dict]:
+    """
+    Generate a catalog with each one of the 'sizes' (number of books) and run all the benchmarks against it, returning
+    one result per benchmark and size.
+    """
+    results = []
+
+    # The cached responses would make the repeated requests measure the cache instead of the database
+    with override_settings(API_CACHE_TIMEOUT=0):
+        for size in sizes:
+            results.extend(run_benchmarks_with_size(size, repeat, seed, log))
+
+    return results
+
+
+def run_benchmarks_with_size(size: int, repeat: int, seed: int, log: Callable[[str], None]) -> List[Dict]:
+    results = []
+
+    authors = max(int(size * AUTHORS_PER_BOOK_RATIO), 1)
+    log(f'Generating catalog with {authors} authors and {size} books...')
+    call_command('generate_catalog', authors=authors, books=size, seed=seed, clear=True, stdout=StringIO())
+
+    for name, function in get_benchmarks():
+        result = measure(function, repeat)
+        result.update(name=name, size=size)
+        results.append(result)
+
+        log(f'{name} [{size}]: {result["median_ms"]:.2f}ms, {result["queries"]} queries, '
+            f'{result["peak_memory_kb"]:.0f}KiB')
+
+    for name, time_ordered in ID_BENCHMARKS:
+        function = functools.partial(insert_catalog_rows, time_ordered)
+        result = measure(function, repeat)
+        result.update(name=name, size=size, index_growth_kb=measure_index_growth(function))
+        results.append(result)
+
+        index_growth = 'unknown' if result['index_growth_kb'] is None else f'{result["index_growth_kb"]:.0f}KiB'
+        log(f'{name} [{size}]: {result["items_per_second"]:.0f} rows/s, index growth {index_growth}')
+
+    return results
+
+
+def measure(function: Callable[[], Optional[int]], repeat: int) -> Dict:
+    """
+    Run the function 'repeat' times, measuring the time, and once more measuring the number of queries and the peak of
+    memory allocated by Python, which slows the code down. The function may return the number of processed items,
+    reported as throughput.
+    """
+    durations = [run_and_roll_back(function)[1] for _ in range(repeat)]
+
+    tracemalloc.start()
+
+    try:
+        with CaptureQueriesContext(connection) as captured_queries:
+            items, _ = run_and_roll_back(function)
+
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # The savepoint queries of the rollback are not part of the benchmark
+    queries = [query for query in captured_queries if 'SAVEPOINT' not in query['sql']]
+
+    result = {
+        'median_ms': statistics.median(durations) * 1000,
+        'min_ms': min(durations) * 1000,
+        'queries': len(queries),
+        'peak_memory_kb': peak_memory / 1024,
+    }
+
+    if items is not None:
+        result['items_per_second'] = items / statistics.median(durations)
+
+    return result
+
+
+def run_and_roll_back(function: Callable[[], Optional[int]]) -> Tuple[Optional[int], float]:
+    """
+    Run the function inside a transaction that is rolled back, so every run starts from the same catalog, returning
+    its result and duration.
+    """
+    try:
+        with transaction.atomic():
+            start = time.perf_counter()
+            items = function()
+            duration = time.perf_counter() - start
+
+            raise BenchmarkRollback
+    except BenchmarkRollback:
+        return items, duration
+
+
+def get_benchmarks() -> List:
+    """
+    Return the (name, function) pairs of the benchmarks, built from the current catalog.
+    """
+    client = Client()
+    book = Book.objects.order_by('id').first()
+    author = Author.objects.order_by('-book_count', 'id').first()
+    authors_ids = [str(author_id) for author_id in Author.objects.order_by('id').values_list('id', flat=True)[:3]]
+
+    def get(url: str, query: Optional[Dict] = None) -> Callable[[], None]:
+        def request():
+            response = client.get(url, query)
+            assert response.status_code == 200, response.content
+
+        return request
+
+    def post(url: str, payload) -> Callable[[], int]:
+        def request():
+            response = client.post(url, payload, content_type='application/json')
+            assert response.status_code == 201, response.content
+
+            return len(payload) if isinstance(payload, list) else 1
+
+        return request
+
+    new_book = {'name': 'Benchmark Book', 'edition': 1, 'publication_year': 2020, 'authors': authors_ids}
+
+    return [
+        ('authors.list', get('/api/authors/')),
+        ('authors.list.filter_name', get('/api/authors/', {'name': author.name[:4]})),
+        ('authors.list.order_book_count', get('/api/authors/', {'ordering': '-book_count'})),
+        ('authors.list.cursor', get('/api/authors/', {'cursor': ''})),
+        ('authors.retrieve', get(f'/api/authors/{author.id}/')),
+        ('books.list', get('/api/books/')),
+        ('books.list.page_size_100', get('/api/books/', {'page_size': 100})),
+        ('books.list.filter_name', get('/api/books/', {'name': book.name[:4]})),
+        ('books.list.filter_author', get('/api/books/', {'author': author.name})),
+        ('books.list.filter_author_id', get('/api/books/', {'author_id': str(author.id)})),
+        ('books.list.filter_publication_year', get('/api/books/', {'publication_year': book.publication_year})),
+        ('books.list.order_author_name', get('/api/books/', {'ordering': 'authors__name'})),
+        ('books.list.order_publication_year', get('/api/books/', {'ordering': '-publication_year'})),
+        ('books.list.cursor', get('/api/books/', {'cursor': ''})),
+        ('books.retrieve', get(f'/api/books/{book.id}/')),
+        ('books.create', post('/api/books/', new_book)),
+        ('books.bulk_create', post('/api/books/', [new_book] * BULK_WRITE_SIZE)),
+        ('import_authors', import_authors),
+    ]
+
+
+def import_authors() -> int:
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['name'])
+
+        for index in range(IMPORT_AUTHORS_SIZE):
+            writer.writerow([f'Imported Author {index}'])
+
+    try:
+        call_command('import_authors', file.name, batch_size=1000, stdout=StringIO())
+    finally:
+        os.unlink(file.name)
+
+    return IMPORT_AUTHORS_SIZE
+
+
+def insert_catalog_rows(time_ordered_ids: bool) -> int:
+    """
+    Insert authors and books, each book with one of the new authors, through the bulk operations of the models, with
+    random or time-ordered primary keys, returning the number of inserted rows.
+    """
+    with override_settings(TIME_ORDERED_IDS=time_ordered_ids):
+        authors = Author.bulk_create([f'Inserted Author {index}' for index in range(INSERT_IDS_SIZE)], validate=False)
+        books = [Book(name=f'Inserted Book {index}', edition=1, publication_year=2000) for index in range(len(authors))]
+        Book.bulk_create(books, [[author] for author in authors], validate=False)
+
+    # Authors, books and the rows of the through table
+    return len(authors) * 3
+
+
+def measure_index_growth(function: Callable) -> Optional[float]:
+    """
+    Return how much the indexes of the catalog tables grow, in KiB, when running the function (rolled back), or None
+    if the database does not report the size of the indexes.
+    """
+    def run():
+        size_before = get_indexes_size(CATALOG_TABLES)
+        function()
+        size_after = get_indexes_size(CATALOG_TABLES)
+
+        return None if size_before is None else (size_after - size_before) / 1024
+
+    return run_and_roll_back(run)[0]
+
+
+def get_indexes_size(tables: List[str]) -> Optional[int]:
+    """
+    Size of all the indexes of the tables, in bytes, including the uncommitted changes of the current transaction. On
+    SQLite it needs the dbstat virtual table, which is not available in every build.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT SUM(pg_relation_size(indexrelid)) FROM pg_index WHERE indrelid = ANY(%s::regclass[])', [tables]
+            )
+        elif connection.vendor == 'sqlite':
+            placeholders = ', '.join(['%s'] * len(tables))
+
+            try:
+                cursor.execute(
+                    'SELECT SUM(pgsize) FROM dbstat WHERE name IN '
+                    f"(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name IN ({placeholders}))",
+                    tables,
+                )
+            except DatabaseError:
+                return None
+        else:
+            return None
+
+        return cursor.fetchone()[0] or 0
+
+
+def compare_results(results: List[Dict], baseline: List[Dict], threshold: float) -> List[str]:
+    """
+    Compare the results with the baseline ones, returning the regressions: benchmarks whose median time grew by more
+    than 'threshold' (a fraction) or that run more queries.
+    """
+    baseline_by_key = {(result['name'], result['size']): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        baseline_result = baseline_by_key.get((result['name'], result['size']))
+
+        if baseline_result is None:
+            continue
+
+        name = f'{result["name"]} [{result["size"]}]'
+
+        if result['median_ms'] > baseline_result['median_ms'] * (1 + threshold):
+            regressions.append(
+                f'{name}: median time went from {baseline_result["median_ms"]:.2f}ms to {result["median_ms"]:.2f}ms.'
+            )
+
+        if result['queries'] > baseline_result['queries']:
+            regressions.append(
+                f'{name}: queries went from {baseline_result["queries"]} to {result["queries"]}.'
+            )
+
+    return regressions
+
@@ -0,0 +1,143 @@
+import functools
+import hashlib
+import time
+from typing import Callable, Iterable
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+AUTHORS_RESOURCE = 'authors'
+BOOKS_RESOURCE = 'books'
+
+CACHE_KEY_PREFIX = 'library:api'
+
+# Headers cached with the data of the responses.
+CACHED_HEADERS = ['ETag', 'Last-Modified']
+
+# How long a request waits for another one that is computing the same response before computing it itself.
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_version(resource: str) -> int:
+    version_key = f'{CACHE_KEY_PREFIX}:{resource}:version'
+    version = cache.get(version_key)
+
+    if version is None:
+        cache.add(version_key, 1, timeout=None)
+        version = cache.get(version_key, 1)
+
+    return version
+
+
+def invalidate(resources: Iterable[str]):
+    """
+    Invalidate all the cached responses of the resources by bumping their versions, so the old entries are never read
+    again and expire by themselves. The versions are bumped again when the current transaction commits, so a response
+    computed with the old data while the transaction was open is not kept under the new version.
+    """
+    resources = list(resources)
+
+    bump_versions(resources)
+    transaction.on_commit(lambda: bump_versions(resources))
+
+
+def bump_versions(resources: Iterable[str]):
+    for resource in resources:
+        version_key = f'{CACHE_KEY_PREFIX}:{resource}:version'
+
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.add(version_key, 2, timeout=None)
+
+
+def get_response_cache_key(request, resource: str, action: str) -> str:
+    """
+    Key of the response for the request, built from the normalized URL: the query parameters are sorted, so their
+    order in the query string does not matter.
+    """
+    query_params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    url = f'{request.scheme}://{request.get_host()}{request.path}?{urlencode(query_params, doseq=True)}'
+    url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+
+    return f'{CACHE_KEY_PREFIX}:{resource}:v{get_version(resource)}:{action}:{url_hash}'
+
+
+def get_or_compute_response(key: str, compute: Callable[[], Response], timeout: int) -> Response:
+    """
+    Return the cached response for 'key' or compute and cache it. Only one request computes a missing response at a
+    time: the others wait for it to be cached (or for the computing request to finish without caching it) instead of
+    hitting the database at the same time.
+    """
+    cached = cache.get(key)
+    if cached is not None:
+        return build_cached_response(cached)
+
+    lock_key = f'{key}:lock'
+
+    if not cache.add(lock_key, True, timeout=LOCK_TIMEOUT):
+        deadline = time.monotonic() + LOCK_TIMEOUT
+
+        while time.monotonic() < deadline and cache.get(lock_key) is not None:
+            time.sleep(LOCK_POLL_INTERVAL)
+
+            cached = cache.get(key)
+            if cached is not None:
+                return build_cached_response(cached)
+
+        return compute()
+
+    try:
+        response = compute()
+
+        if response.status_code == status.HTTP_200_OK:
+            headers = {header: response[header] for header in CACHED_HEADERS if response.has_header(header)}
+            cache.set(key, (response.status_code, response.data, headers), timeout=timeout)
+
+        response['X-Cache'] = 'MISS'
+
+        return response
+    finally:
+        cache.delete(lock_key)
+
+
+def build_cached_response(cached) -> Response:
+    status_code, data, headers = cached
+
+    response = Response(data, status=status_code, headers=headers)
+    response['X-Cache'] = 'HIT'
+
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Cache the responses of the list and retrieve actions of a viewset, keyed by the normalized URL and the version of
+    the 'cache_resource', which is bumped by the model signals whenever the data behind it changes.
+
+    The timeout is the API_CACHE_TIMEOUT setting, in seconds, and 0 disables the cache.
+    """
+    cache_resource = None
+
+    def list(self, request, *args, **kwargs):
+        compute = functools.partial(super().list, request, *args, **kwargs)
+        return self.get_cached_response(request, 'list', compute)
+
+    def retrieve(self, request, *args, **kwargs):
+        compute = functools.partial(super().retrieve, request, *args, **kwargs)
+        return self.get_cached_response(request, 'retrieve', compute)
+
+    def get_cached_response(self, request, action: str, compute: Callable[[], Response]) -> Response:
+        timeout = getattr(settings, 'API_CACHE_TIMEOUT', 0)
+
+        if not timeout:
+            return compute()
+
+        key = get_response_cache_key(request, self.cache_resource, action)
+
+        return get_or_compute_response(key, compute, timeout)
@@ -0,0 +1,88 @@
+import functools
+import hashlib
+from typing import Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag and Last-Modified headers to the list and retrieve actions of a viewset and answer the If-None-Match and
+    If-Modified-Since requests with 304 Not Modified before fetching or serializing anything.
+
+    The validators come from a single aggregate query on the filtered queryset: the count of rows and their latest
+    'updated_at', which the model signals keep in sync with the related rows embedded in the responses. The count
+    changes the ETag when a row is removed from a list, which the Last-Modified date misses.
+
+    CachedResponseMixin must come before this mixin in the bases of the viewset: it caches the headers with the data,
+    so the cached responses are validated without any query.
+    """
+    last_modified_field = 'updated_at'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        compute = functools.partial(super().list, request, *args, **kwargs)
+
+        return self.get_conditional_response(request, queryset, compute)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        compute = functools.partial(super().retrieve, request, *args, **kwargs)
+
+        try:
+            queryset = self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            # Invalid lookup value, the action itself answers with 404
+            return compute()
+
+        return self.get_conditional_response(request, queryset, compute)
+
+    def get_conditional_response(self, request, queryset: QuerySet, compute):
+        etag, last_modified = self.get_validators(request, queryset)
+
+        not_modified_response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        response = not_modified_response or compute()
+
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response['ETag'] = etag
+
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+
+        return response
+
+    def get_validators(self, request, queryset: QuerySet) -> Tuple[str, Optional[int]]:
+        """
+        Return the ETag and the Last-Modified timestamp of the response for the queryset. The ETag also depends on the
+        URL and the renderer, since the page, the ordering and the format change the response for the same data.
+        """
+        aggregates = queryset.order_by().aggregate(count=Count('*'), last_modified=Max(self.last_modified_field))
+        last_modified = aggregates['last_modified']
+        renderer = getattr(request, 'accepted_renderer', None)
+
+        etag_parts = [request.get_full_path(), getattr(renderer, 'format', ''), aggregates['count'], last_modified]
+        etag = hashlib.md5('|'.join(str(part) for part in etag_parts).encode('utf-8')).hexdigest()
+
+        last_modified_timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+
+        return quote_etag(etag), last_modified_timestamp
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        # The cached responses skip the actions, so they are validated with their cached headers here
+        if not 200 <= response.status_code < 300 or not response.has_header('ETag'):
+            return response
+
+        last_modified = response.get('Last-Modified')
+        not_modified_response = get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+            response=response,
+        )
+
+        return not_modified_response or response
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List
+
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .utils import batched
+
+# Number of rows fetched from the database cursor and serialized at a time.
+EXPORT_CHUNK_SIZE = 2000
+
+# Separator of the author names in the authors column of the books CSV files, exported by the API and imported by the
+# import_books command.
+AUTHORS_CSV_SEPARATOR = ';'
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer of the exports in NDJSON format, one JSON object per line. The exports are streamed without it, so it
+    only renders the error responses.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data, cls=JSONEncoder, ensure_ascii=False) + '\n').encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renderer of the exports in CSV format. The exports are streamed without it, so it only renders the error
+    responses, as a single row with their keys as header.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(data.keys())
+        writer.writerow(' '.join(value) if isinstance(value, list) else value for value in data.values())
+
+        return output.getvalue().encode(self.charset)
+
+
+class ExportMixin:
+    """
+    Add the 'export' action to a viewset, which streams the whole filtered and ordered queryset without pagination,
+    as NDJSON (the default) or CSV, chosen by the Accept header or the 'format' query parameter.
+
+    The rows are read from the database with a server-side cursor (on PostgreSQL) and serialized by the list
+    serializer in chunks of 'export_chunk_size' rows, so the export runs in constant memory. The CSV columns are the
+    'export_csv_fields'.
+    """
+    export_chunk_size = EXPORT_CHUNK_SIZE
+    export_csv_fields = []
+
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.get_export_rows(queryset)
+        renderer = request.accepted_renderer
+
+        if renderer.format == CSVRenderer.format:
+            content = self.stream_csv(rows)
+        else:
+            content = stream_ndjson(rows, self.export_chunk_size)
+
+        response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset={renderer.charset}')
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}.{renderer.format}"'
+
+        return response
+
+    def get_export_rows(self, queryset) -> Iterator[Dict]:
+        rows = queryset.iterator(chunk_size=self.export_chunk_size)
+
+        for batch in batched(rows, self.export_chunk_size):
+            yield from self.get_serializer(batch, many=True).data
+
+    def get_export_csv_row(self, row: Dict) -> List:
+        return [row[field] for field in self.export_csv_fields]
+
+    def stream_csv(self, rows: Iterable[Dict]) -> Iterator[str]:
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(self.export_csv_fields)
+
+        for batch in batched(rows, self.export_chunk_size):
+            writer.writerows(self.get_export_csv_row(row) for row in batch)
+
+            yield output.getvalue()
+
+            output.seek(0)
+            output.truncate()
+
+        # Only the header, when there are no rows
+        if output.tell():
+            yield output.getvalue()
+
+
+def stream_ndjson(rows: Iterable[Dict], chunk_size: int) -> Iterator[str]:
+    encoder = JSONEncoder(ensure_ascii=False)
+
+    for batch in batched(rows, chunk_size):
+        yield ''.join(encoder.encode(row) + '\n' for row in batch)
@@ -1,20 +1,65 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
 
+from library import search
 from library.models import Author, Book
 
 
+class UUIDInFilter(filters.BaseInFilter, filters.UUIDFilter):
+    pass
+
+
+class OrderingFilterWithAliases(OrderingFilter):
+    """
+    Ordering filter that replaces the ordering fields in the 'ordering_field_aliases' of the view by the fields that
+    back them, e.g. a denormalized column instead of a field of a join.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        aliases = getattr(view, 'ordering_field_aliases', {})
+
+        if not ordering:
+            return ordering
+
+        return [
+            ('-' if field.startswith('-') else '') + aliases.get(field.lstrip('-'), field.lstrip('-'))
+            for field in ordering
+        ]
+
+
 class AuthorFilter(filters.FilterSet):
-    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    name = filters.CharFilter(method='filter_name')
 
     class Meta:
         model = Author
         fields = ['name']
 
+    def filter_name(self, queryset, name, value):
+        return search.filter_name_contains(queryset, value)
+
 
 class BookFilter(filters.FilterSet):
-    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
-    author = filters.CharFilter(field_name='authors__name', lookup_expr='icontains')
+    name = filters.CharFilter(method='filter_name')
+    author = filters.CharFilter(method='filter_author')
+    author_id = UUIDInFilter(method='filter_author_id')
 
     class Meta:
         model = Book
         fields = ['edition', 'publication_year']
+
+    def filter_name(self, queryset, name, value):
+        return search.filter_name_contains(queryset, value)
+
+    def filter_author(self, queryset, name, value):
+        return search.filter_books_by_author_name_contains(queryset, value)
+
+    def filter_author_id(self, queryset, name, value):
+        """
+        Books of any of the authors, matched with an EXISTS subquery on the (author_id, book_id) index of the through
+        table, so books of several of the authors are not repeated.
+        """
+        book_authors = Book.authors.through.objects.filter(book_id=OuterRef('pk'), author_id__in=value)
+
+        return queryset.filter(Exists(book_authors))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from library import cache
+from library.models import Book
+from library.utils import batched, validate_positive_option
+
+BATCH_SIZE_ARG = 'batch_size'
+
+
+class Command(BaseCommand):
+    help = 'Recompute the author sort key of all the books, used to order them by author name'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            dest=BATCH_SIZE_ARG,
+            type=int,
+            default=1000,
+            help='Number of books updated in each transaction.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = validate_positive_option('--batch-size', options[BATCH_SIZE_ARG])
+
+        self.stdout.write(self.style.SUCCESS('Updating books...'))
+
+        total_books = 0
+        books_ids = Book.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=batch_size)
+
+        for batch in batched(books_ids, batch_size):
+            with transaction.atomic():
+                total_books += Book.update_primary_author_sort(Book.objects.filter(pk__in=batch))
+
+        if total_books:
+            # The books lists ordered by author are cached
+            cache.invalidate([cache.BOOKS_RESOURCE])
+
+        success_message = f'1 book updated.' if total_books == 1 else f'{total_books} books updated.'
+
+        self.stdout.write(self.style.SUCCESS(success_message))
@@ -0,0 +1,135 @@
+import datetime
+import json
+import platform
+import subprocess
+from typing import List, Optional
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from library.benchmarks import compare_results, run_benchmarks
+from library.utils import validate_positive_option
+
+SIZES_ARG = 'sizes'
+REPEAT_ARG = 'repeat'
+SEED_ARG = 'seed'
+OUTPUT_ARG = 'output'
+COMPARE_ARG = 'compare'
+THRESHOLD_ARG = 'threshold'
+
+DEFAULT_SIZES = '1000,10000'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the API and the import commands against generated catalogs, in a separate test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            dest=SIZES_ARG,
+            default=DEFAULT_SIZES,
+            help=f'Comma separated numbers of books of the generated catalogs. Default: "{DEFAULT_SIZES}".',
+        )
+        parser.add_argument(
+            '--repeat',
+            dest=REPEAT_ARG,
+            type=int,
+            default=5,
+            help='Number of timed runs of each benchmark. Default: 5.',
+        )
+        parser.add_argument(
+            '--seed',
+            dest=SEED_ARG,
+            type=int,
+            default=0,
+            help='Seed of the generated catalogs. Default: 0.',
+        )
+        parser.add_argument(
+            '--output',
+            dest=OUTPUT_ARG,
+            default=None,
+            help='JSON file where the results are written.',
+        )
+        parser.add_argument(
+            '--compare',
+            dest=COMPARE_ARG,
+            default=None,
+            help='JSON file with the results of a previous run. The command fails if any benchmark regressed.',
+        )
+        parser.add_argument(
+            '--threshold',
+            dest=THRESHOLD_ARG,
+            type=float,
+            default=0.2,
+            help='Fraction of the baseline median time a benchmark may grow before it is a regression. Default: 0.2.',
+        )
+
+    def handle(self, *args, **options):
+        sizes = self.parse_sizes(options[SIZES_ARG])
+        repeat = validate_positive_option('--repeat', options[REPEAT_ARG])
+
+        baseline = self.read_results(options[COMPARE_ARG]) if options[COMPARE_ARG] else None
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+
+        try:
+            results = run_benchmarks(sizes, repeat, options[SEED_ARG], log=self.stdout.write)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options[OUTPUT_ARG]:
+            with open(options[OUTPUT_ARG], 'w') as file:
+                json.dump({'metadata': self.get_metadata(), 'results': results}, file, indent=2)
+
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options[OUTPUT_ARG]}.'))
+
+        if baseline is not None:
+            regressions = compare_results(results, baseline, options[THRESHOLD_ARG])
+
+            if regressions:
+                raise CommandError('Regressions found:\n' + '\n'.join(regressions))
+
+            self.stdout.write(self.style.SUCCESS('No regressions found.'))
+
+    @staticmethod
+    def parse_sizes(value: str) -> List[int]:
+        try:
+            sizes = [int(size) for size in value.split(',')]
+        except ValueError:
+            sizes = []
+
+        if not sizes or any(size < 1 for size in sizes):
+            raise CommandError('The --sizes option must be a comma separated list of positive integers.')
+
+        return sizes
+
+    @staticmethod
+    def read_results(filepath: str) -> List:
+        try:
+            with open(filepath) as file:
+                return json.load(file)['results']
+        except FileNotFoundError:
+            raise CommandError(f'File "{filepath}" not found.')
+        except (ValueError, KeyError):
+            raise CommandError(f'File "{filepath}" does not have benchmark results.')
+
+    @staticmethod
+    def get_metadata() -> dict:
+        return {
+            'commit': get_git_commit(),
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+        }
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.strip()
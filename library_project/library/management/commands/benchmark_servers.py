@@ -0,0 +1,107 @@
+import json
+from typing import List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from library.management.commands.benchmark import Command as BenchmarkCommand
+from library.models import Author, Book
+from library.server_benchmarks import SERVERS, run_server_benchmarks
+from library.utils import validate_positive_option
+
+SERVERS_ARG = 'servers'
+WORKERS_ARG = 'workers'
+CONCURRENCY_ARG = 'concurrency'
+REQUESTS_ARG = 'requests'
+PORT_ARG = 'port'
+OUTPUT_ARG = 'output'
+
+DEFAULT_SERVERS = 'wsgi,asgi'
+
+
+class Command(BaseCommand):
+    help = 'Load test the read endpoints of the API served by gunicorn with WSGI and with ASGI (uvicorn) workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--servers',
+            dest=SERVERS_ARG,
+            default=DEFAULT_SERVERS,
+            help=f'Comma separated servers to benchmark, among {", ".join(SERVERS)}. Default: "{DEFAULT_SERVERS}".',
+        )
+        parser.add_argument(
+            '--workers',
+            dest=WORKERS_ARG,
+            type=int,
+            default=2,
+            help='Number of worker processes of the servers. Default: 2.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            dest=CONCURRENCY_ARG,
+            type=int,
+            default=32,
+            help='Number of requests sent at the same time. Default: 32.',
+        )
+        parser.add_argument(
+            '--requests',
+            dest=REQUESTS_ARG,
+            type=int,
+            default=1000,
+            help='Number of requests sent to each endpoint. Default: 1000.',
+        )
+        parser.add_argument(
+            '--port',
+            dest=PORT_ARG,
+            type=int,
+            default=8100,
+            help='Port where the servers listen. Default: 8100.',
+        )
+        parser.add_argument(
+            '--output',
+            dest=OUTPUT_ARG,
+            default=None,
+            help='JSON file where the results are written.',
+        )
+
+    def handle(self, *args, **options):
+        servers = self.parse_servers(options[SERVERS_ARG])
+
+        for option in [WORKERS_ARG, CONCURRENCY_ARG, REQUESTS_ARG]:
+            validate_positive_option(f'--{option}', options[option])
+
+        paths = self.get_paths()
+
+        results = run_server_benchmarks(
+            servers, paths, options[WORKERS_ARG], options[CONCURRENCY_ARG], options[REQUESTS_ARG], options[PORT_ARG],
+            log=self.stdout.write,
+        )
+
+        if options[OUTPUT_ARG]:
+            with open(options[OUTPUT_ARG], 'w') as file:
+                json.dump({'metadata': BenchmarkCommand.get_metadata(), 'results': results}, file, indent=2)
+
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options[OUTPUT_ARG]}.'))
+
+    @staticmethod
+    def parse_servers(value: str) -> List[str]:
+        servers = value.split(',')
+
+        if any(server not in SERVERS for server in servers):
+            raise CommandError(f'The --servers option must be a comma separated list of {", ".join(SERVERS)}.')
+
+        return servers
+
+    @staticmethod
+    def get_paths() -> List[Tuple[str, str]]:
+        book = Book.objects.order_by('id').first()
+        author = Author.objects.order_by('id').first()
+
+        if book is None or author is None:
+            raise CommandError('The database has no books, generate a catalog with the generate_catalog command.')
+
+        return [
+            ('authors.list', '/api/authors/'),
+            ('authors.retrieve', f'/api/authors/{author.id}/'),
+            ('books.list', '/api/books/'),
+            ('books.retrieve', f'/api/books/{book.id}/'),
+        ]
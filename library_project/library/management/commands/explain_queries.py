@@ -0,0 +1,251 @@
+import itertools
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import RequestFactory
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from library.models import Book
+from library.pagination import (
+    CountMode, EstimatedCountPaginator, KeysetPagination, estimate_count, get_field_value, get_keyset_filter,
+)
+from library.utils import validate_positive_option
+from library.views import AuthorViewSet, BookViewSet
+
+PAGE_SIZE_ARG = 'page_size'
+CHECK_ARG = 'check'
+
+PAGE_NUMBER_PAGINATION = 'page'
+KEYSET_PAGINATION = 'cursor'
+
+# Tables of the plan lines that read whole tables: "Seq Scan on <table>" on PostgreSQL and "SCAN [TABLE] <table>"
+# without an index on SQLite.
+POSTGRESQL_SEQ_SCAN_PATTERN = re.compile(r'Seq Scan on (\w+)')
+SQLITE_SEQ_SCAN_PATTERN = re.compile(r'\bSCAN (?:TABLE )?(\w+)(?!.*\b(?:USING|VIRTUAL TABLE)\b)')
+SQLITE_NOT_TABLES = ['CONSTANT', 'SUBQUERY']
+
+
+class Command(BaseCommand):
+    help = ('Run EXPLAIN for the page, count and validators queries of every combination of filters, ordering and '
+            'pagination of the list endpoints and report the ones that scan whole tables')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            dest=PAGE_SIZE_ARG,
+            type=int,
+            default=10,
+            help='Page size of the explained queries. Default: 10.',
+        )
+        parser.add_argument(
+            '--check',
+            dest=CHECK_ARG,
+            action='store_true',
+            help='Fail if any query scans a whole table.',
+        )
+
+    def handle(self, *args, **options):
+        page_size = validate_positive_option('--page-size', options[PAGE_SIZE_ARG])
+
+        # The planner of an empty database scans the tables whatever the indexes are
+        book = Book.objects.filter(authors__isnull=False).order_by('id').first()
+
+        if book is None:
+            raise CommandError('The database has no books, generate a catalog with the generate_catalog command.')
+
+        author = book.authors.order_by('id').first()
+        endpoints = [
+            (AuthorViewSet, {'name': author.name[:4]}),
+            (BookViewSet, {
+                'name': book.name[:4],
+                'author': author.name[:4],
+                'author_id': str(author.id),
+                'edition': book.edition,
+                'publication_year': book.publication_year,
+            }),
+        ]
+
+        explained = 0
+        seq_scans = []
+
+        for viewset_class, filter_values in endpoints:
+            for query_params in get_query_params_combinations(viewset_class, filter_values):
+                query_params['page_size'] = page_size
+                queryset = get_page_queryset(viewset_class, query_params)
+
+                if queryset is None:
+                    continue
+
+                description = describe_query(viewset_class, query_params)
+                plans = [(description, queryset.explain())]
+                plans += [
+                    (f'{description} validators', explain_sql(sql, params))
+                    for sql, params in get_validators_queries(viewset_class, query_params)
+                ]
+
+                if KeysetPagination.cursor_query_param not in query_params:
+                    plans += [
+                        (describe_query(viewset_class, {**query_params, 'count': count_mode}), explain_sql(sql, params))
+                        for count_mode, sql, params in get_count_queries(viewset_class, query_params)
+                    ]
+
+                for description, plan in plans:
+                    tables = find_seq_scans(plan)
+                    explained += 1
+
+                    if tables:
+                        seq_scans.append(description)
+                        self.stdout.write(self.style.WARNING(f'{description}: sequential scan on {", ".join(tables)}'))
+
+                    if options['verbosity'] >= 2:
+                        self.stdout.write(f'{description}:\n{plan}\n')
+
+        summary = f'{explained} queries explained, {len(seq_scans)} with sequential scans.'
+
+        if seq_scans and options[CHECK_ARG]:
+            raise CommandError(summary)
+
+        self.stdout.write(self.style.SUCCESS(summary))
+
+
+def get_query_params_combinations(viewset_class, filter_values: Dict) -> Iterator[Dict]:
+    """
+    Yield the query parameters of every combination of the filters with 'filter_values', of the orderings (both
+    directions of each ordering field and the default one) and of the paginations of the list endpoint.
+    """
+    orderings = [None] + [
+        f'{direction}{field}' for field in viewset_class.ordering_fields for direction in ['', '-']
+    ]
+
+    for filters_count in range(len(filter_values) + 1):
+        for filters in itertools.combinations(filter_values, filters_count):
+            for ordering, pagination in itertools.product(orderings, [PAGE_NUMBER_PAGINATION, KEYSET_PAGINATION]):
+                query_params = {name: filter_values[name] for name in filters}
+
+                if ordering is not None:
+                    query_params['ordering'] = ordering
+
+                if pagination == KEYSET_PAGINATION:
+                    query_params[KeysetPagination.cursor_query_param] = ''
+
+                yield query_params
+
+
+def get_list_view(viewset_class, query_params: Dict):
+    request = Request(RequestFactory().get('/', query_params))
+
+    return viewset_class(request=request, format_kwarg=None, args=(), kwargs={}, action='list')
+
+
+def get_page_queryset(viewset_class, query_params: Dict) -> Optional[QuerySet]:
+    """
+    Return the query of the list endpoint for the query parameters: the first page with page number pagination, or
+    the second page with keyset pagination, which filters on the position of the first result. None if the parameters
+    are not valid.
+    """
+    view = get_list_view(viewset_class, query_params)
+    request = view.request
+
+    try:
+        queryset = view.filter_queryset(view.get_queryset())
+        page_size = view.paginator.get_page_size(request)
+
+        if KeysetPagination.cursor_query_param not in query_params:
+            return queryset[:page_size]
+
+        ordering = KeysetPagination().get_keyset_ordering(request, queryset, view)
+        queryset = queryset.order_by(*ordering)
+        first_result = queryset.first()
+    except APIException:
+        return None
+
+    if first_result is not None:
+        position = [get_field_value(first_result, field.lstrip('-')) for field in ordering]
+        queryset = queryset.filter(get_keyset_filter(ordering, position))
+
+    return queryset[:page_size + 1]
+
+
+def get_validators_queries(viewset_class, query_params: Dict) -> List[Tuple[str, Sequence]]:
+    """
+    Return the (SQL, params) of the aggregate query of the ETag and Last-Modified headers of the list endpoint, which
+    runs on every request and reads all the filtered rows.
+    """
+    view = get_list_view(viewset_class, query_params)
+    queryset = view.filter_queryset(view.get_queryset())
+
+    with capture_queries() as queries:
+        view.get_validators(view.request, queryset)
+
+    return queries
+
+
+def get_count_queries(viewset_class, query_params: Dict) -> Iterator[Tuple[str, str, Sequence]]:
+    """
+    Yield the (count mode, SQL, params) of the queries that count the results of the list endpoint with page number
+    pagination, for the exact and the estimated counts. They read all the filtered rows, unlike the page query.
+    """
+    view = get_list_view(viewset_class, query_params)
+    queryset = view.filter_queryset(view.get_queryset())
+    counts = [
+        (CountMode.EXACT, queryset.count),
+        (CountMode.ESTIMATED, lambda: estimate_count(queryset, EstimatedCountPaginator.count_cap)),
+    ]
+
+    for count_mode, count in counts:
+        with capture_queries() as queries:
+            count()
+
+        # The estimated count may read the table statistics instead of the table
+        for sql, params in queries:
+            if queryset.model._meta.db_table in sql:
+                yield count_mode, sql, params
+
+
+@contextmanager
+def capture_queries() -> Iterator[List[Tuple[str, Sequence]]]:
+    """
+    Record the (SQL, params) of the queries run inside the context.
+    """
+    queries = []
+
+    def execute_wrapper(execute, sql, params, many, context):
+        queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(execute_wrapper):
+        yield queries
+
+
+def explain_sql(sql: str, params: Sequence) -> str:
+    """
+    Plan of the query, formatted like QuerySet.explain().
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        rows = cursor.fetchall()
+
+    return '\n'.join(row[0] if len(row) == 1 else ' '.join(str(value) for value in row) for row in rows)
+
+
+def find_seq_scans(plan: str) -> List[str]:
+    if connection.vendor == 'postgresql':
+        return sorted(set(POSTGRESQL_SEQ_SCAN_PATTERN.findall(plan)))
+
+    tables = [
+        match.group(1) for line in plan.splitlines() for match in [SQLITE_SEQ_SCAN_PATTERN.search(line)] if match
+    ]
+
+    return sorted(set(table for table in tables if table.upper() not in SQLITE_NOT_TABLES))
+
+
+def describe_query(viewset_class, query_params: Dict) -> str:
+    resource = viewset_class.cache_resource
+    params = ', '.join(f'{key}={value}' for key, value in query_params.items() if key != 'page_size')
+
+    return f'{resource} [{params}]' if params else f'{resource} []'
@@ -0,0 +1,297 @@
+import csv
+import datetime
+import hashlib
+import io
+import random
+import string
+import time
+import uuid
+from array import array
+from typing import Iterator, List, Sequence, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from library import cache
+from library.models import Author, Book
+from library.utils import batched, validate_non_negative_option, validate_positive_option
+
+AUTHORS_ARG = 'authors'
+BOOKS_ARG = 'books'
+AUTHORS_PER_BOOK_ARG = 'authors_per_book'
+SEED_ARG = 'seed'
+BATCH_SIZE_ARG = 'batch_size'
+CLEAR_ARG = 'clear'
+
+# Weights of the number of authors of each book, as "<number of authors>:<weight>" pairs.
+DEFAULT_AUTHORS_PER_BOOK = '1:70,2:20,3:7,4:3'
+
+FIRST_NAMES = [
+    'Ana', 'Bruno', 'Carla', 'Daniel', 'Elena', 'Felipe', 'Gabriela', 'Hugo', 'Isabel', 'João', 'Karen', 'Lucas',
+    'Maria', 'Nicolas', 'Olivia', 'Pedro', 'Quentin', 'Rafaela', 'Samuel', 'Teresa', 'Ursula', 'Victor', 'Wanda',
+    'Xavier', 'Yara', 'Zeca', 'Agatha', 'Neil', 'Terry', 'Jane', 'Isaac', 'Octavia', 'Haruki', 'Chimamanda',
+]
+LAST_NAMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Pereira', 'Costa', 'Almeida', 'Ferreira', 'Ribeiro', 'Carvalho',
+    'Gomes', 'Martins', 'Araújo', 'Barbosa', 'Rocha', 'Dias', 'Christie', 'Gaiman', 'Pratchett', 'Austen', 'Le Guin',
+    'Asimov', 'Butler', 'Murakami', 'Adichie', 'Tolkien', 'Lispector', 'Machado', 'Borges', 'Calvino',
+]
+TITLE_WORDS = [
+    'the', 'of', 'and', 'a', 'night', 'garden', 'city', 'river', 'shadow', 'light', 'stone', 'house', 'war', 'peace',
+    'time', 'memory', 'ocean', 'storm', 'winter', 'summer', 'fire', 'glass', 'silver', 'crown', 'secret', 'journey',
+    'empire', 'dream', 'island', 'mountain', 'forest', 'letter', 'song', 'book', 'machine', 'star', 'north', 'last',
+]
+MAX_TITLE_WORDS = 6
+MAX_EDITION = 10
+MIN_PUBLICATION_YEAR = 1800
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic catalog of authors and books for load and regression testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--authors',
+            dest=AUTHORS_ARG,
+            type=int,
+            default=1000,
+            help='Number of authors to generate. Default: 1000.',
+        )
+        parser.add_argument(
+            '--books',
+            dest=BOOKS_ARG,
+            type=int,
+            default=1000,
+            help='Number of books to generate. Default: 1000.',
+        )
+        parser.add_argument(
+            '--authors-per-book',
+            dest=AUTHORS_PER_BOOK_ARG,
+            default=DEFAULT_AUTHORS_PER_BOOK,
+            help='Distribution of the number of authors of each book, as comma separated '
+                 f'"<number of authors>:<weight>" pairs. Default: "{DEFAULT_AUTHORS_PER_BOOK}".',
+        )
+        parser.add_argument(
+            '--seed',
+            dest=SEED_ARG,
+            type=int,
+            default=0,
+            help='Seed of the random data. The same seed and options always generate the same catalog. Default: 0.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            dest=BATCH_SIZE_ARG,
+            type=int,
+            default=10000,
+            help='Number of rows inserted in each transaction. Default: 10000.',
+        )
+        parser.add_argument(
+            '--clear',
+            dest=CLEAR_ARG,
+            action='store_true',
+            help='Delete all the authors and books before generating the catalog.',
+        )
+
+    def handle(self, *args, **options):
+        authors_count = validate_non_negative_option('--authors', options[AUTHORS_ARG])
+        books_count = validate_non_negative_option('--books', options[BOOKS_ARG])
+        authors_per_book = parse_authors_per_book(options[AUTHORS_PER_BOOK_ARG])
+        seed = options[SEED_ARG]
+        batch_size = validate_positive_option('--batch-size', options[BATCH_SIZE_ARG])
+
+        if books_count and not authors_count:
+            raise CommandError('Books can not be generated without authors.')
+
+        if options[CLEAR_ARG]:
+            self.stdout.write(self.style.SUCCESS('Deleting the catalog...'))
+            clear_catalog()
+
+        generator = CatalogGenerator(authors_count, books_count, authors_per_book, seed)
+
+        if authors_count and Author.objects.filter(pk=generator.get_author_id(0)).exists():
+            raise CommandError(
+                f'A catalog with the seed {seed} was already generated, use --clear to generate it again or another '
+                '--seed to add a new one.'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Generating catalog...'))
+        start = time.perf_counter()
+
+        try:
+            self.insert_authors(generator, batch_size)
+            self.insert_books(generator, batch_size)
+        except IntegrityError as e:
+            raise CommandError(f'The generated catalog conflicts with the existing authors or books: {e}')
+
+        # The rows are inserted without sending the model signals
+        cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{authors_count} authors and {books_count} books generated in {elapsed:.2f}s.'
+        ))
+
+    def insert_authors(self, generator: 'CatalogGenerator', batch_size: int):
+        fields = ['id', 'created_at', 'updated_at', 'name', 'book_count']
+
+        for batch_number, batch in enumerate(batched(generator.generate_authors_rows(), batch_size), 1):
+            with transaction.atomic():
+                insert_rows(Author, fields, batch)
+
+            self.stdout.write(f'Authors batch {batch_number}: {len(batch)} authors inserted.')
+
+    def insert_books(self, generator: 'CatalogGenerator', batch_size: int):
+        fields = ['id', 'created_at', 'updated_at', 'name', 'edition', 'publication_year', 'primary_author_sort']
+        book_authors_fields = ['book_id', 'author_id']
+
+        for batch_number, batch in enumerate(batched(generator.generate_books(), batch_size), 1):
+            book_authors_rows = [
+                (book_row[0], author_id) for book_row, authors_ids in batch for author_id in authors_ids
+            ]
+
+            with transaction.atomic():
+                insert_rows(Book, fields, [book_row for book_row, _ in batch])
+                insert_rows(Book.authors.through, book_authors_fields, book_authors_rows)
+
+            self.stdout.write(f'Books batch {batch_number}: {len(batch)} books inserted.')
+
+
+class CatalogGenerator:
+    """
+    Deterministic generator of the rows of the catalog. The authors are derived from their index, so the books can
+    reference them without holding all of them in memory, and their book counts are computed beforehand by drawing
+    the authors of all the books once with the same seed used to generate the books.
+    """
+
+    def __init__(self, authors_count: int, books_count: int, authors_per_book: Sequence[Tuple[int, int]], seed: int):
+        self.authors_count = authors_count
+        self.books_count = books_count
+        self.authors_per_book_values = [value for value, _ in authors_per_book]
+        self.authors_per_book_weights = [weight for _, weight in authors_per_book]
+        self.seed = seed
+        self.now = timezone.now()
+
+    def generate_authors_indexes(self) -> Iterator[List[int]]:
+        rng = random.Random(f'{self.seed}:authors')
+
+        for _ in range(self.books_count):
+            count = rng.choices(self.authors_per_book_values, self.authors_per_book_weights)[0]
+            yield rng.sample(range(self.authors_count), min(count, self.authors_count))
+
+    def generate_authors_rows(self) -> Iterator[Tuple]:
+        book_counts = array('L', [0]) * self.authors_count
+
+        for authors_indexes in self.generate_authors_indexes():
+            for index in authors_indexes:
+                book_counts[index] += 1
+
+        for index in range(self.authors_count):
+            yield self.get_author_id(index), self.now, self.now, get_author_name(index, self.seed), book_counts[index]
+
+    def generate_books(self) -> Iterator[Tuple[Tuple, List[uuid.UUID]]]:
+        """
+        Yield the row of each book with the ids of its authors.
+        """
+        rng = random.Random(f'{self.seed}:books')
+        current_year = datetime.date.today().year
+
+        for authors_indexes in self.generate_authors_indexes():
+            title_words = rng.choices(TITLE_WORDS, k=rng.randint(1, MAX_TITLE_WORDS))
+            name = ' '.join(title_words).capitalize()[:Book._meta.get_field('name').max_length]
+            edition = min(int(rng.expovariate(1)) + 1, MAX_EDITION)
+            publication_year = rng.randint(MIN_PUBLICATION_YEAR, current_year)
+            primary_author_sort = min(get_author_name(index, self.seed) for index in authors_indexes)
+
+            book_row = (
+                uuid.UUID(int=rng.getrandbits(128), version=4), self.now, self.now, name, edition, publication_year,
+                primary_author_sort,
+            )
+
+            yield book_row, [self.get_author_id(index) for index in authors_indexes]
+
+    def get_author_id(self, index: int) -> uuid.UUID:
+        digest = hashlib.blake2b(f'{self.seed}:{index}'.encode('ascii'), digest_size=16).digest()
+
+        return uuid.UUID(bytes=digest, version=4)
+
+
+def get_author_name(index: int, seed: int = 0) -> str:
+    """
+    Unique name of the author at 'index', combining first names, middle initials and last names, with a number
+    suffix once all the combinations are used. The names of the catalogs generated with other seeds than the default
+    one end with their seed, so catalogs of different seeds can be generated in the same database.
+    """
+    first_name = FIRST_NAMES[index % len(FIRST_NAMES)]
+    index //= len(FIRST_NAMES)
+    initial = string.ascii_uppercase[index % len(string.ascii_uppercase)]
+    index //= len(string.ascii_uppercase)
+    last_name = LAST_NAMES[index % len(LAST_NAMES)]
+    index //= len(LAST_NAMES)
+
+    name = f'{first_name} {initial}. {last_name}'
+
+    if index:
+        name = f'{name} {index + 1}'
+
+    return name if seed == 0 else f'{name} #{seed}'
+
+
+def parse_authors_per_book(value: str) -> List[Tuple[int, int]]:
+    try:
+        pairs = [tuple(int(number) for number in pair.split(':')) for pair in value.split(',')]
+        valid = all(len(pair) == 2 and pair[0] >= 1 and pair[1] >= 0 for pair in pairs)
+        valid = valid and any(weight for _, weight in pairs)
+    except ValueError:
+        valid = False
+
+    if not valid:
+        raise CommandError(
+            'The --authors-per-book option must be comma separated "<number of authors>:<weight>" pairs, with '
+            'positive numbers of authors and at least one positive weight, like "1:70,2:30".'
+        )
+
+    return pairs
+
+
+def insert_rows(model, fields: List[str], rows: Sequence[Tuple]):
+    """
+    Insert the rows with COPY on PostgreSQL or with bulk_create otherwise, without validating them nor sending the
+    model signals.
+    """
+    if not rows:
+        return
+
+    if connection.vendor == 'postgresql':
+        copy_rows(model, fields, rows)
+    else:
+        model.objects.bulk_create([model(**dict(zip(fields, row))) for row in rows])
+
+
+def copy_rows(model, fields: List[str], rows: Sequence[Tuple]):
+    columns = [model._meta.get_field(field).column for field in fields]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    for row in rows:
+        writer.writerow(value.isoformat() if isinstance(value, datetime.datetime) else value for value in row)
+
+    buffer.seek(0)
+
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {model._meta.db_table} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)', buffer
+        )
+
+
+def clear_catalog():
+    tables = [model._meta.db_table for model in [Book.authors.through, Book, Author]]
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'TRUNCATE {", ".join(tables)}')
+        else:
+            for table in tables:
+                cursor.execute(f'DELETE FROM {table}')
+
+    cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
@@ -1,52 +1,242 @@
+import collections
 import csv
-from typing import List
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 
+import django
 from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
-from library.models import Author
+from library.models import Author, OnConflict
+from library.utils import batched, grouped, validate_positive_option
 
 FILEPATH_ARG = 'file'
+BATCH_SIZE_ARG = 'batch_size'
+COMMIT_EVERY_ARG = 'commit_every'
+ON_CONFLICT_ARG = 'on_conflict'
+WORKERS_ARG = 'workers'
 AUTHOR_NAME_CSV_KEY = 'name'
 
+# Size of the byte ranges of the file processed by each task when importing with multiple workers.
+WORKER_RANGE_SIZE = 4 * 1024 * 1024
+
 
 class Command(BaseCommand):
     help = 'Import authors from CSV file and store in the database'
 
     def add_arguments(self, parser):
         parser.add_argument(FILEPATH_ARG, type=str)
+        parser.add_argument(
+            '--batch-size',
+            dest=BATCH_SIZE_ARG,
+            type=int,
+            default=None,
+            help='Stream the file and insert the authors in batches of this size. '
+                 'By default the whole file is inserted in a single batch.',
+        )
+        parser.add_argument(
+            '--commit-every',
+            dest=COMMIT_EVERY_ARG,
+            type=int,
+            default=None,
+            help='Number of batches inserted in each transaction. '
+                 'By default the whole file is imported in a single transaction.',
+        )
+        parser.add_argument(
+            '--on-conflict',
+            dest=ON_CONFLICT_ARG,
+            choices=OnConflict.values,
+            default=OnConflict.FAIL,
+            help='What to do with authors that already exist or are repeated in the file: "fail" aborts the import, '
+                 '"skip" ignores them and "update" touches their last update date. Default: "fail".',
+        )
+        parser.add_argument(
+            '--workers',
+            dest=WORKERS_ARG,
+            type=int,
+            default=None,
+            help='Number of processes used to read, normalize and validate the file, which is split in byte ranges. '
+                 'Requires one author per line. By default the file is processed by the importing process.',
+        )
 
-    @transaction.atomic
     def handle(self, *args, **options):
         filepath = options[FILEPATH_ARG]
+        batch_size = validate_positive_option('--batch-size', options[BATCH_SIZE_ARG])
+        commit_every = validate_positive_option('--commit-every', options[COMMIT_EVERY_ARG])
+        on_conflict = options[ON_CONFLICT_ARG]
+        workers = validate_positive_option('--workers', options[WORKERS_ARG])
 
         self.stdout.write(self.style.SUCCESS('Importing authors...'))
 
-        authors = self.import_authors_from_file_and_save_to_database(filepath)
+        total_authors = self.import_authors_from_file_and_save_to_database(
+            filepath, batch_size, commit_every, on_conflict, workers
+        )
 
-        total_authors = len(authors)
         success_message = f'1 author imported.' if total_authors == 1 else f'{total_authors} authors imported.'
 
         self.stdout.write(self.style.SUCCESS(success_message))
 
-    def import_authors_from_file_and_save_to_database(self, filepath: str) -> List[Author]:
-        names = self.get_authors_names_from_file(filepath)
+    def import_authors_from_file_and_save_to_database(
+        self,
+        filepath: str,
+        batch_size: Optional[int] = None,
+        commit_every: Optional[int] = None,
+        on_conflict: str = OnConflict.FAIL,
+        workers: Optional[int] = None,
+    ) -> int:
+        """
+        Import the authors of the file in batches of 'batch_size' names, grouping 'commit_every' batches in each
+        transaction. The file is read lazily, so only the current batch is held in memory.
+
+        If 'workers' is given, the names are normalized and validated by a pool of processes and this process only
+        writes the clean batches to the database.
+
+        Returns the total number of imported authors.
+        """
+        if workers is None:
+            names = self.get_authors_names_from_file(filepath)
+        else:
+            names = self.get_clean_authors_names_from_file_in_parallel(filepath, workers)
+
+        validate = workers is None
+        batches = batched(names, batch_size)
+
+        total_authors = 0
+        batch_number = 0
+
+        for transaction_batches in grouped(batches, commit_every):
+            with transaction.atomic():
+                for batch in transaction_batches:
+                    batch_number += 1
+                    total_authors += self.import_batch(batch, batch_number, on_conflict, validate)
+
+        return total_authors
+
+    def import_batch(self, names: List[str], batch_number: int, on_conflict: str, validate: bool = True) -> int:
+        start = time.perf_counter()
 
         try:
-            return Author.bulk_create(names)
+            authors = Author.bulk_create(names, on_conflict, validate)
         except ValidationError as e:
             raise CommandError(e.messages)
 
-    def get_authors_names_from_file(self, filepath: str) -> List[str]:
+        elapsed = time.perf_counter() - start
+        throughput = len(authors) / elapsed if elapsed > 0 else len(authors)
+
+        self.stdout.write(
+            f'Batch {batch_number}: {len(authors)} authors imported in {elapsed:.2f}s ({throughput:.0f} authors/s), '
+            f'{len(names) - len(authors)} already existing or repeated.'
+        )
+
+        return len(authors)
+
+    def get_authors_names_from_file(self, filepath: str) -> Iterator[str]:
         try:
             with open(filepath) as file:
                 csv_reader = csv.DictReader(file)
 
-                return [row[AUTHOR_NAME_CSV_KEY] for row in csv_reader if row[AUTHOR_NAME_CSV_KEY]]
+                for row in csv_reader:
+                    if row[AUTHOR_NAME_CSV_KEY]:
+                        yield row[AUTHOR_NAME_CSV_KEY]
         except FileNotFoundError:
             raise CommandError(f'File not found: "{filepath}"')
         except KeyError:
             raise CommandError(
                 f'The "{AUTHOR_NAME_CSV_KEY}" column is missing from the header in the "{filepath}" file'
             )
+
+    def get_clean_authors_names_from_file_in_parallel(self, filepath: str, workers: int) -> Iterator[str]:
+        """
+        Split the file in byte ranges aligned to line boundaries and normalize and validate each range in a pool of
+        'workers' processes. The names are yielded in file order and at most two ranges per worker are in flight, so
+        memory stays bounded even when the database writes are slower than the workers.
+        """
+        name_column, data_start = self.get_name_column_and_data_start(filepath)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+            pending = collections.deque()
+
+            for range_start, range_end in split_file_in_byte_ranges(filepath, data_start, WORKER_RANGE_SIZE):
+                pending.append(
+                    executor.submit(clean_authors_names_in_byte_range, filepath, range_start, range_end, name_column)
+                )
+
+                if len(pending) >= 2 * workers:
+                    yield from self.get_worker_result(pending.popleft())
+
+            while pending:
+                yield from self.get_worker_result(pending.popleft())
+
+    def get_name_column_and_data_start(self, filepath: str) -> Tuple[int, int]:
+        try:
+            with open(filepath, 'rb') as file:
+                header_line = file.readline()
+        except FileNotFoundError:
+            raise CommandError(f'File not found: "{filepath}"')
+
+        header = next(csv.reader([header_line.decode()]), [])
+
+        if AUTHOR_NAME_CSV_KEY not in header:
+            raise CommandError(
+                f'The "{AUTHOR_NAME_CSV_KEY}" column is missing from the header in the "{filepath}" file'
+            )
+
+        return header.index(AUTHOR_NAME_CSV_KEY), len(header_line)
+
+    @staticmethod
+    def get_worker_result(future) -> List[str]:
+        names, error_messages = future.result()
+
+        if error_messages:
+            raise CommandError(error_messages)
+
+        return names
+
+
+def split_file_in_byte_ranges(filepath: str, start: int, range_size: int) -> Iterator[Tuple[int, int]]:
+    """
+    Return (start, end) byte offsets that split the file from 'start' in ranges of about 'range_size' bytes, always
+    ending right after a line break.
+    """
+    file_size = os.path.getsize(filepath)
+
+    with open(filepath, 'rb') as file:
+        while start < file_size:
+            file.seek(min(start + range_size, file_size))
+            file.readline()
+            end = file.tell()
+
+            yield start, end
+
+            start = end
+
+
+def clean_authors_names_in_byte_range(filepath: str, start: int, end: int, name_column: int) -> Tuple[List, List]:
+    """
+    Read the CSV lines in the byte range of the file, returning the normalized non-blank author names and the
+    validation error messages. It runs in a worker process, so it must not access the database.
+    """
+    with open(filepath, 'rb') as file:
+        file.seek(start)
+        lines = file.read(end - start).decode().splitlines()
+
+    names = []
+    error_messages = []
+
+    for row in csv.reader(lines):
+        if len(row) <= name_column or not row[name_column]:
+            continue
+
+        author = Author(name=row[name_column])
+
+        try:
+            author.full_clean(validate_unique=False)
+        except ValidationError as e:
+            error_messages.extend(e.messages)
+        else:
+            names.append(author.name)
+
+    return names, error_messages
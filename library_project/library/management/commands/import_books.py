@@ -0,0 +1,251 @@
+import csv
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from library.export import AUTHORS_CSV_SEPARATOR
+from library.models import NAME_LOOKUP_BATCH_SIZE, Author, Book, OnConflict, strip_and_remove_duplicate_spaces
+from library.utils import batched, grouped, validate_positive_option
+
+FILEPATH_ARG = 'file'
+FORMAT_ARG = 'format'
+BATCH_SIZE_ARG = 'batch_size'
+COMMIT_EVERY_ARG = 'commit_every'
+CREATE_AUTHORS_ARG = 'create_authors'
+
+CSV_FORMAT = 'csv'
+NDJSON_FORMAT = 'ndjson'
+NDJSON_EXTENSIONS = ['.ndjson', '.jsonl']
+
+BOOK_NAME_KEY = 'name'
+BOOK_EDITION_KEY = 'edition'
+BOOK_PUBLICATION_YEAR_KEY = 'publication_year'
+BOOK_AUTHORS_KEY = 'authors'
+BOOK_KEYS = [BOOK_NAME_KEY, BOOK_EDITION_KEY, BOOK_PUBLICATION_YEAR_KEY, BOOK_AUTHORS_KEY]
+
+
+class Command(BaseCommand):
+    help = 'Import books from CSV or NDJSON file and store in the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(FILEPATH_ARG, type=str)
+        parser.add_argument(
+            '--format',
+            dest=FORMAT_ARG,
+            choices=[CSV_FORMAT, NDJSON_FORMAT],
+            default=None,
+            help='Format of the file. By default it is inferred from the file extension '
+                 f'({", ".join(NDJSON_EXTENSIONS)} for NDJSON, CSV otherwise).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            dest=BATCH_SIZE_ARG,
+            type=int,
+            default=None,
+            help='Stream the file and insert the books in batches of this size. '
+                 'By default the whole file is inserted in a single batch.',
+        )
+        parser.add_argument(
+            '--commit-every',
+            dest=COMMIT_EVERY_ARG,
+            type=int,
+            default=None,
+            help='Number of batches inserted in each transaction. '
+                 'By default the whole file is imported in a single transaction.',
+        )
+        parser.add_argument(
+            '--create-authors',
+            dest=CREATE_AUTHORS_ARG,
+            action='store_true',
+            help='Create the authors that do not exist instead of failing the import.',
+        )
+
+    def handle(self, *args, **options):
+        filepath = options[FILEPATH_ARG]
+        file_format = options[FORMAT_ARG] or self.infer_file_format(filepath)
+        batch_size = validate_positive_option('--batch-size', options[BATCH_SIZE_ARG])
+        commit_every = validate_positive_option('--commit-every', options[COMMIT_EVERY_ARG])
+        create_authors = options[CREATE_AUTHORS_ARG]
+
+        self.stdout.write(self.style.SUCCESS('Importing books...'))
+
+        total_books = self.import_books_from_file_and_save_to_database(
+            filepath, file_format, batch_size, commit_every, create_authors
+        )
+
+        success_message = f'1 book imported.' if total_books == 1 else f'{total_books} books imported.'
+
+        self.stdout.write(self.style.SUCCESS(success_message))
+
+    def import_books_from_file_and_save_to_database(
+        self,
+        filepath: str,
+        file_format: str = CSV_FORMAT,
+        batch_size: Optional[int] = None,
+        commit_every: Optional[int] = None,
+        create_authors: bool = False,
+    ) -> int:
+        """
+        Import the books of the file in batches of 'batch_size' books, grouping 'commit_every' batches in each
+        transaction. The file is read lazily, so only the current batch is held in memory.
+
+        Returns the total number of imported books.
+        """
+        if file_format == NDJSON_FORMAT:
+            rows = self.get_books_rows_from_ndjson_file(filepath)
+        else:
+            rows = self.get_books_rows_from_csv_file(filepath)
+
+        total_books = 0
+        batch_number = 0
+
+        for transaction_batches in grouped(batched(rows, batch_size), commit_every):
+            with transaction.atomic():
+                for batch in transaction_batches:
+                    batch_number += 1
+                    total_books += self.import_batch(batch, batch_number, create_authors)
+
+        return total_books
+
+    def import_batch(self, rows: List[Tuple[int, Dict]], batch_number: int, create_authors: bool) -> int:
+        """
+        Validate the books of the batch, resolve all their authors with a few queries and insert them in bulk. The
+        errors of all the books of the batch are reported at once, prefixed by their line in the file.
+        """
+        start = time.perf_counter()
+
+        books = []
+        books_authors_names = []
+        error_messages = []
+
+        for line_number, row in rows:
+            book = Book(
+                name=row.get(BOOK_NAME_KEY),
+                edition=row.get(BOOK_EDITION_KEY),
+                publication_year=row.get(BOOK_PUBLICATION_YEAR_KEY),
+            )
+
+            try:
+                book.full_clean(validate_unique=False)
+            except ValidationError as e:
+                error_messages.extend(f'Line {line_number}: {message}' for message in e.messages)
+
+            try:
+                authors_names = parse_authors_names(row.get(BOOK_AUTHORS_KEY))
+            except ValueError as e:
+                authors_names = []
+                error_messages.append(f'Line {line_number}: {e}')
+            else:
+                if not authors_names:
+                    error_messages.append(f'Line {line_number}: The book must have at least one author.')
+
+            books.append(book)
+            books_authors_names.append((line_number, authors_names))
+
+        authors_names = {name for _, names in books_authors_names for name in names}
+        authors_by_name = self.get_authors_by_name(authors_names, create_authors)
+
+        for line_number, names in books_authors_names:
+            error_messages.extend(
+                f'Line {line_number}: Author with the name "{name}" does not exist.'
+                for name in names
+                if name not in authors_by_name
+            )
+
+        if error_messages:
+            raise CommandError(error_messages)
+
+        books_authors = [[authors_by_name[name] for name in names] for _, names in books_authors_names]
+        created_books = Book.bulk_create(books, books_authors, validate=False)
+
+        elapsed = time.perf_counter() - start
+        throughput = len(created_books) / elapsed if elapsed > 0 else len(created_books)
+
+        self.stdout.write(
+            f'Batch {batch_number}: {len(created_books)} books imported in {elapsed:.2f}s ({throughput:.0f} books/s).'
+        )
+
+        return len(created_books)
+
+    def get_authors_by_name(self, names: Set[str], create_authors: bool) -> Dict[str, Author]:
+        authors_by_name = {}
+
+        for names_batch in batched(names, NAME_LOOKUP_BATCH_SIZE):
+            authors = Author.objects.filter(name__in=names_batch).only('id', 'name')
+            authors_by_name.update((author.name, author) for author in authors)
+
+        missing_names = sorted(names - authors_by_name.keys())
+
+        if create_authors and missing_names:
+            try:
+                new_authors = Author.bulk_create(missing_names, OnConflict.SKIP)
+            except ValidationError as e:
+                raise CommandError(e.messages)
+
+            authors_by_name.update((author.name, author) for author in new_authors)
+
+        return authors_by_name
+
+    def get_books_rows_from_csv_file(self, filepath: str) -> Iterator[Tuple[int, Dict]]:
+        try:
+            with open(filepath, newline='') as file:
+                csv_reader = csv.DictReader(file)
+                missing_columns = [key for key in BOOK_KEYS if key not in (csv_reader.fieldnames or BOOK_KEYS)]
+
+                if missing_columns:
+                    raise CommandError(
+                        f'The {", ".join(missing_columns)} columns are missing from the header in the "{filepath}" file'
+                    )
+
+                for row in csv_reader:
+                    yield csv_reader.line_num, row
+        except FileNotFoundError:
+            raise CommandError(f'File not found: "{filepath}"')
+
+    def get_books_rows_from_ndjson_file(self, filepath: str) -> Iterator[Tuple[int, Dict]]:
+        try:
+            with open(filepath) as file:
+                for line_number, line in enumerate(file, start=1):
+                    if not line.strip():
+                        continue
+
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise CommandError(f'Line {line_number}: Invalid JSON: {e}')
+
+                    if not isinstance(row, dict):
+                        raise CommandError(f'Line {line_number}: Each line must contain a JSON object.')
+
+                    yield line_number, row
+        except FileNotFoundError:
+            raise CommandError(f'File not found: "{filepath}"')
+
+    @staticmethod
+    def infer_file_format(filepath: str) -> str:
+        _, extension = os.path.splitext(filepath)
+
+        return NDJSON_FORMAT if extension.lower() in NDJSON_EXTENSIONS else CSV_FORMAT
+
+
+def parse_authors_names(authors: Union[str, List, None]) -> List[str]:
+    """
+    Return the normalized non-blank author names, which are either a list (NDJSON) or a string separated by
+    AUTHORS_CSV_SEPARATOR (CSV). Raises ValueError for any other type.
+    """
+    if authors is None:
+        return []
+
+    if isinstance(authors, str):
+        authors = authors.split(AUTHORS_CSV_SEPARATOR)
+    elif not isinstance(authors, list):
+        raise ValueError('The authors must be a list of names.')
+
+    names = (strip_and_remove_duplicate_spaces(str(name)) for name in authors if name is not None)
+
+    return [name for name in names if name]
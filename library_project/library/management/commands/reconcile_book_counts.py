@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from library import cache
+from library.models import Author
+from library.utils import batched, validate_positive_option
+
+BATCH_SIZE_ARG = 'batch_size'
+
+
+class Command(BaseCommand):
+    help = 'Recount the books of all the authors, fixing the counts that are out of sync'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            dest=BATCH_SIZE_ARG,
+            type=int,
+            default=1000,
+            help='Number of authors checked in each transaction.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = validate_positive_option('--batch-size', options[BATCH_SIZE_ARG])
+
+        self.stdout.write(self.style.SUCCESS('Counting books...'))
+
+        fixed_authors = 0
+        authors_ids = Author.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=batch_size)
+
+        for batch in batched(authors_ids, batch_size):
+            with transaction.atomic():
+                fixed_authors += Author.update_book_count(Author.objects.filter(pk__in=batch))
+
+        if fixed_authors:
+            cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
+
+        success_message = f'1 author fixed.' if fixed_authors == 1 else f'{fixed_authors} authors fixed.'
+
+        self.stdout.write(self.style.SUCCESS(success_message))
@@ -0,0 +1,62 @@
+"""
+Prometheus metrics of the requests, labeled by the URL name of the view ('books-list', 'authors-detail', ...), the
+method and the status code of the response.
+
+When the 'prometheus_multiproc_dir' environment variable is set (see gunicorn.conf.py) every process writes its metrics
+to files in that directory and the /metrics endpoint aggregates the files of all the gunicorn workers. Otherwise it
+exposes the metrics of the process serving it.
+"""
+import os
+
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+MULTIPROCESS_DIR_ENV = 'prometheus_multiproc_dir'
+
+# Label of the requests to URLs that do not match any view, so unknown paths do not create new series.
+UNMATCHED_VIEW = 'unmatched'
+
+REQUEST_LABELS = ['view', 'method', 'status']
+
+REQUEST_LATENCY = Histogram(
+    'library_request_duration_seconds', 'Duration of the requests, in seconds.', REQUEST_LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf')),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'library_requests_in_progress', 'Requests being served.', ['view', 'method'], multiprocess_mode='livesum',
+)
+RESPONSE_SIZE = Histogram(
+    'library_response_size_bytes', 'Size of the response bodies, in bytes.', REQUEST_LABELS,
+    buckets=(100, 1000, 10000, 100000, 1000000, 10000000, float('inf')),
+)
+REQUEST_QUERIES = Histogram(
+    'library_request_db_queries', 'Number of SQL queries of the requests.', REQUEST_LABELS,
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100, float('inf')),
+)
+
+
+def get_view_name(request) -> str:
+    """
+    URL name of the view of the request, including its namespace, or the dotted path of the view when the URL has no
+    name.
+    """
+    try:
+        return resolve(request.path_info).view_name
+    except Resolver404:
+        return UNMATCHED_VIEW
+
+
+def get_registry():
+    if MULTIPROCESS_DIR_ENV not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+
+    return registry
+
+
+def metrics_view(request):
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
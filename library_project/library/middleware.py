@@ -0,0 +1,109 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from library import metrics
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = 'X-DB-Query-Count'
+QUERY_TIME_HEADER = 'X-DB-Time'
+
+
+class QueryStats:
+    """
+    Database execute wrapper counting the queries run through it and adding up their durations, in seconds.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def record_queries(stats: QueryStats) -> ExitStack:
+    """
+    Return a context manager that records the queries of all the database connections in 'stats'.
+    """
+    stack = ExitStack()
+
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(stats))
+
+    return stack
+
+
+class QueryStatsMiddleware:
+    """
+    Record the number of SQL queries and the total database time of each request when the SQL_INSTRUMENTATION setting
+    is enabled, exposing them as the X-DB-Query-Count and X-DB-Time (milliseconds) response headers and as the
+    'db_query_count' and 'db_time_ms' fields of a log record of the 'library.middleware' logger.
+
+    The queries of a streaming response run while its content is iterated, after the headers are sent, so they are not
+    recorded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'SQL_INSTRUMENTATION', False):
+            return self.get_response(request)
+
+        stats = QueryStats()
+
+        with record_queries(stats):
+            response = self.get_response(request)
+
+        db_time_ms = stats.duration * 1000
+
+        response[QUERY_COUNT_HEADER] = str(stats.count)
+        response[QUERY_TIME_HEADER] = f'{db_time_ms:.2f}'
+
+        logger.info(
+            '%s %s: %d queries in %.2fms', request.method, request.path, stats.count, db_time_ms,
+            extra={'db_query_count': stats.count, 'db_time_ms': db_time_ms},
+        )
+
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, the response size and the number of SQL queries of each request, and the number of requests
+    in progress, in the Prometheus metrics exposed by the /metrics endpoint.
+
+    The size of streaming responses is not known, so it is not recorded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        view = metrics.get_view_name(request)
+        stats = QueryStats()
+        start = time.perf_counter()
+
+        with metrics.REQUESTS_IN_PROGRESS.labels(view, request.method).track_inprogress(), record_queries(stats):
+            response = self.get_response(request)
+
+        labels = (view, request.method, str(response.status_code))
+
+        metrics.REQUEST_LATENCY.labels(*labels).observe(time.perf_counter() - start)
+        metrics.REQUEST_QUERIES.labels(*labels).observe(stats.count)
+
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+
+        return response
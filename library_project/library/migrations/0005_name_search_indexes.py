@@ -0,0 +1,24 @@
+# Indexes for the case-insensitive substring searches on the names of authors and books.
+
+from django.db import migrations
+
+from library import search
+
+
+def create_search_indexes(apps, schema_editor):
+    search.create_search_indexes(schema_editor)
+
+
+def drop_search_indexes(apps, schema_editor):
+    search.drop_search_indexes(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0004_auto_20200416_2220'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Index of the authors through table for the author_id filter of the books, so the books of the authors are found
+# without reading the through table rows.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0006_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX library_book_authors_author_id_book_id_idx ON library_book_authors (author_id, book_id)',
+            'DROP INDEX library_book_authors_author_id_book_id_idx',
+        ),
+    ]
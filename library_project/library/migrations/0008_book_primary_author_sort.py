@@ -0,0 +1,38 @@
+# Generated by Django 3.0.5 on 2026-10-17 17:30
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from library import search
+
+
+def backfill_primary_author_sort(apps, schema_editor):
+    Author = apps.get_model('library', 'Author')
+    Book = apps.get_model('library', 'Book')
+
+    first_author_name = Subquery(Author.objects.filter(books=OuterRef('pk')).order_by('name').values('name')[:1])
+    Book.objects.update(primary_author_sort=Coalesce(first_author_name, Value('')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0007_book_authors_author_index'),
+    ]
+
+    operations = [
+        # SQLite rebuilds the table to add the column, dropping the triggers of its search index
+        *search.preserve_sqlite_search_indexes(
+            migrations.AddField(
+                model_name='book',
+                name='primary_author_sort',
+                field=models.CharField(blank=True, default='', editable=False, max_length=100),
+            ),
+            migrations.AddIndex(
+                model_name='book',
+                index=models.Index(fields=['primary_author_sort', 'id'], name='library_boo_primary_532f5b_idx'),
+            ),
+        ),
+        migrations.RunPython(backfill_primary_author_sort, migrations.RunPython.noop),
+    ]
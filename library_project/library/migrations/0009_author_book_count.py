@@ -0,0 +1,39 @@
+# Generated by Django 3.0.5 on 2026-10-17 17:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from library import search
+
+
+def backfill_book_count(apps, schema_editor):
+    Author = apps.get_model('library', 'Author')
+    BookAuthor = apps.get_model('library', 'Book').authors.through
+
+    book_authors = BookAuthor.objects.filter(author_id=OuterRef('pk')).order_by().values('author_id')
+    book_count = Subquery(book_authors.annotate(count=Count('*')).values('count'))
+    Author.objects.update(book_count=Coalesce(book_count, Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0008_book_primary_author_sort'),
+    ]
+
+    operations = [
+        # SQLite rebuilds the table to add the column, dropping the triggers of its search index
+        *search.preserve_sqlite_search_indexes(
+            migrations.AddField(
+                model_name='author',
+                name='book_count',
+                field=models.PositiveIntegerField(default=0, editable=False),
+            ),
+            migrations.AddIndex(
+                model_name='author',
+                index=models.Index(fields=['book_count', 'id'], name='library_aut_book_co_7293f4_idx'),
+            ),
+        ),
+        migrations.RunPython(backfill_book_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.5 on 2026-10-17 17:53
+
+from django.db import migrations, models
+
+import library.models
+from library import search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0009_author_book_count'),
+    ]
+
+    # Only the default of the primary keys changes: the ids of the existing rows are kept, since they are exposed by the
+    # API.
+    operations = [
+        # SQLite rebuilds the tables to alter the fields, dropping the triggers of their search indexes
+        *search.preserve_sqlite_search_indexes(
+            migrations.AlterField(
+                model_name='author',
+                name='id',
+                field=models.UUIDField(default=library.models.generate_id, editable=False, primary_key=True, serialize=False),
+            ),
+            migrations.AlterField(
+                model_name='book',
+                name='id',
+                field=models.UUIDField(default=library.models.generate_id, editable=False, primary_key=True, serialize=False),
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.0.5 on 2026-10-17 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0010_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['name', 'id'], name='library_boo_name_45231e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['edition', 'name', 'id'], name='library_boo_edition_902944_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['publication_year', 'name', 'id'], name='library_boo_publica_f6c5ba_idx'),
+        ),
+    ]
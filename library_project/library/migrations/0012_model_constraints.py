@@ -0,0 +1,34 @@
+# Generated by Django 3.0.5 on 2026-10-17 17:58
+
+from django.db import migrations, models
+
+from library import search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0011_book_filter_ordering_indexes'),
+    ]
+
+    operations = [
+        # SQLite rebuilds the tables to add the constraints, dropping the triggers of their search indexes
+        *search.preserve_sqlite_search_indexes(
+            migrations.AddConstraint(
+                model_name='author',
+                constraint=models.CheckConstraint(check=models.Q(_negated=True, name=''), name='library_author_name_not_blank'),
+            ),
+            migrations.AddConstraint(
+                model_name='book',
+                constraint=models.CheckConstraint(check=models.Q(_negated=True, name=''), name='library_book_name_not_blank'),
+            ),
+            migrations.AddConstraint(
+                model_name='book',
+                constraint=models.CheckConstraint(check=models.Q(edition__gte=1), name='library_book_edition_gte_1'),
+            ),
+            migrations.AddConstraint(
+                model_name='book',
+                constraint=models.CheckConstraint(check=models.Q(publication_year__gte=1), name='library_book_publication_year_gte_1'),
+            ),
+        ),
+    ]
@@ -1,33 +1,87 @@
 from __future__ import annotations
 
 import uuid
-from typing import List
+from contextlib import nullcontext
+from typing import List, Optional
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
+from library import cache
+from library.utils import batched, uuid7
 from library.validators import validate_is_not_blank, validate_earlier_than_current_year
 
+NAME_LOOKUP_BATCH_SIZE = 500
+
+
+class OnConflict(models.TextChoices):
+    FAIL = 'fail'
+    SKIP = 'skip'
+    UPDATE = 'update'
+
+
+def generate_id() -> uuid.UUID:
+    """
+    Primary key of the new rows: a time-ordered UUID when the TIME_ORDERED_IDS setting is enabled, so the inserts are
+    appended to the end of the primary key indexes instead of at random points, or a random UUID otherwise.
+    """
+    if getattr(settings, 'TIME_ORDERED_IDS', False):
+        return uuid7()
+
+    return uuid.uuid4()
+
 
 class AbstractBaseModel(models.Model):
-    id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
+    id = models.UUIDField(primary_key=True, editable=False, default=generate_id)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+    def save(self, *args, validate: bool = True, **kwargs):
+        """
+        Validate the model with full_clean() and save it.
+
+        If 'validate' is False, the fields are only normalized by clean() and the invariants are left to the database
+        constraints, saving the queries of the unique checks. When a constraint fails, full_clean() finds the invalid
+        fields and raises the same ValidationError it would have raised before the save.
+        """
+        if validate:
+            self.full_clean()
+            super().save(*args, **kwargs)
+            return
+
+        self.clean()
+        connection = transaction.get_connection(kwargs.get('using'))
+
+        try:
+            # Inside a transaction, the savepoint keeps it usable for the queries of full_clean()
+            with transaction.atomic(using=connection.alias) if connection.in_atomic_block else nullcontext():
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            self.full_clean()
+            raise
 
 
 class Author(AbstractBaseModel):
     name = models.CharField(max_length=100, unique=True, validators=[validate_is_not_blank])
+    # Number of books of the author, kept in sync by the signals and the bulk operations of the books.
+    book_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = 'author'
         verbose_name_plural = 'authors'
+        indexes = [models.Index(fields=['updated_at']), models.Index(fields=['book_count', 'id'])]
+        constraints = [
+            # The names are normalized by clean(), so a blank name is an empty one
+            models.CheckConstraint(check=~Q(name=''), name='library_author_name_not_blank'),
+        ]
 
     def __str__(self):
         return self.name
@@ -39,15 +93,77 @@ class Author(AbstractBaseModel):
     def unique_error_message(self, model_class, unique_check):
         return f'Author with the name "{self.name}" already exists.'
 
+    @staticmethod
+    def update_book_count(authors: QuerySet, excluded_book: Optional[Book] = None) -> int:
+        """
+        Recompute the 'book_count' of the authors with a single update, ignoring 'excluded_book', which is about to
+        be removed from them. Only the authors whose count changed are updated, touching their 'updated_at'.
+
+        Returns the number of updated authors.
+        """
+        book_authors = Book.authors.through.objects.filter(author_id=OuterRef('pk'))
+
+        if excluded_book is not None:
+            book_authors = book_authors.exclude(book_id=excluded_book.pk)
+
+        book_count = Coalesce(
+            Subquery(book_authors.order_by().values('author_id').annotate(count=Count('*')).values('count')), Value(0)
+        )
+
+        return authors.exclude(book_count=book_count).update(book_count=book_count, updated_at=timezone.now())
+
     @staticmethod
     @transaction.atomic
-    def bulk_create(author_names: List[str]) -> List[Author]:
-        authors = [Author(name=author_name) for author_name in author_names]
+    def bulk_create(
+        author_names: List[str], on_conflict: str = OnConflict.FAIL, validate: bool = True
+    ) -> List[Author]:
+        """
+        Validate and insert the authors with the given names, returning the created ones.
+
+        The names are normalized and deduplicated, and the existing ones are looked up with a single query instead of
+        one unique check per author. Names that already exist are handled according to 'on_conflict': 'fail' raises a
+        ValidationError listing all of them, 'skip' ignores them and 'update' touches their 'updated_at'.
+
+        If 'validate' is False, the names must have already been validated and normalized by the caller.
+        """
+        authors_by_name = {}
+        repeated_names = set()
+
+        for author_name in author_names:
+            author = Author(name=author_name)
+
+            if validate:
+                author.full_clean(validate_unique=False)
+
+            if author.name in authors_by_name:
+                repeated_names.add(author.name)
+            else:
+                authors_by_name[author.name] = author
+
+        existing_names = set()
+
+        for names in batched(authors_by_name, NAME_LOOKUP_BATCH_SIZE):
+            existing_names.update(Author.objects.filter(name__in=names).values_list('name', flat=True))
 
-        for author in authors:
-            author.full_clean()
+        if on_conflict == OnConflict.FAIL:
+            conflicting_names = existing_names | repeated_names
 
-        return Author.objects.bulk_create(authors)
+            if conflicting_names:
+                raise ValidationError([
+                    authors_by_name[name].unique_error_message(Author, ('name',)) for name in sorted(conflicting_names)
+                ])
+        elif on_conflict == OnConflict.UPDATE:
+            for names in batched(existing_names, NAME_LOOKUP_BATCH_SIZE):
+                Author.objects.filter(name__in=names).update(updated_at=timezone.now())
+
+        new_authors = [author for name, author in authors_by_name.items() if name not in existing_names]
+
+        created_authors = Author.objects.bulk_create(new_authors, ignore_conflicts=on_conflict != OnConflict.FAIL)
+
+        # bulk_create does not send the model signals
+        cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
+
+        return created_authors
 
 
 class Book(AbstractBaseModel):
@@ -57,10 +173,28 @@ class Book(AbstractBaseModel):
         validators=[MinValueValidator(limit_value=1), validate_earlier_than_current_year]
     )
     authors = models.ManyToManyField(Author, related_name='books')
+    # Name of the first author in alphabetical order, kept in sync by the signals and the bulk operations, used to order
+    # the books by author without joining the authors.
+    primary_author_sort = models.CharField(max_length=100, blank=True, default='', editable=False)
 
     class Meta:
         verbose_name = 'book'
         verbose_name_plural = 'books'
+        indexes = [
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['primary_author_sort', 'id']),
+            # The default ordering, with the id of the keyset pagination
+            models.Index(fields=['name', 'id']),
+            # The edition and publication year filters, ordered by name, and the orderings by them
+            models.Index(fields=['edition', 'name', 'id']),
+            models.Index(fields=['publication_year', 'name', 'id']),
+        ]
+        # The publication year is not checked against the current year, which is not a constant
+        constraints = [
+            models.CheckConstraint(check=~Q(name=''), name='library_book_name_not_blank'),
+            models.CheckConstraint(check=Q(edition__gte=1), name='library_book_edition_gte_1'),
+            models.CheckConstraint(check=Q(publication_year__gte=1), name='library_book_publication_year_gte_1'),
+        ]
 
     def __str__(self):
         return self.name
@@ -69,6 +203,116 @@ class Book(AbstractBaseModel):
         if self.name:
             self.name = strip_and_remove_duplicate_spaces(self.name)
 
+    @staticmethod
+    @transaction.atomic
+    def bulk_create(books: List[Book], books_authors: List[List[Author]], validate: bool = True) -> List[Book]:
+        """
+        Insert the books, where 'books_authors' holds the authors of the book at the same position, using one insert
+        for the books and another for all the rows of the authors through table.
+
+        If 'validate' is False, the books must have already been validated by the caller.
+        """
+        if validate:
+            for book in books:
+                book.full_clean(validate_unique=False)
+
+        for book, authors in zip(books, books_authors):
+            book.primary_author_sort = get_primary_author_sort(authors)
+
+        created_books = Book.objects.bulk_create(books)
+
+        Book.authors.through.objects.bulk_create(Book.get_book_authors(created_books, books_authors))
+
+        authors_ids = {author.id for authors in books_authors for author in authors}
+        Author.update_book_count(Author.objects.filter(pk__in=authors_ids))
+
+        # bulk_create does not send the model signals
+        cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
+
+        return created_books
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_update(
+        books: List[Book], fields: List[str], books_authors: List[Optional[List[Author]]], validate: bool = True
+    ) -> List[Book]:
+        """
+        Save the 'fields' of the books with a single update statement per batch and replace the authors of the books
+        whose item in 'books_authors' is not None, deleting and inserting the rows of the through table in bulk.
+
+        If 'validate' is False, the books must have already been validated by the caller.
+        """
+        if validate:
+            for book in books:
+                book.full_clean(validate_unique=False)
+
+        # bulk_update ignores auto_now
+        now = timezone.now()
+        for book, authors in zip(books, books_authors):
+            book.updated_at = now
+
+            if authors is not None:
+                book.primary_author_sort = get_primary_author_sort(authors)
+
+        Book.objects.bulk_update(books, [*fields, 'updated_at', 'primary_author_sort'])
+
+        books_with_new_authors = [(book, authors) for book, authors in zip(books, books_authors) if authors is not None]
+
+        if books_with_new_authors:
+            BookAuthor = Book.authors.through
+            updated_books, new_books_authors = zip(*books_with_new_authors)
+
+            old_book_authors = BookAuthor.objects.filter(book_id__in=[book.id for book in updated_books])
+
+            authors_ids = set(old_book_authors.values_list('author_id', flat=True))
+            authors_ids.update(author.id for authors in new_books_authors for author in authors)
+
+            old_book_authors.delete()
+            BookAuthor.objects.bulk_create(Book.get_book_authors(updated_books, new_books_authors))
+
+            Author.update_book_count(Author.objects.filter(pk__in=authors_ids))
+
+        # bulk_update does not send the model signals
+        cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
+
+        return books
+
+    @staticmethod
+    def update_primary_author_sort(books: QuerySet, excluded_author: Optional[Author] = None) -> int:
+        """
+        Recompute the 'primary_author_sort' of the books with a single update, ignoring 'excluded_author', which is
+        about to be removed from them. Only the books whose sort key changed are updated.
+
+        Returns the number of updated books.
+        """
+        authors = Author.objects.filter(books=OuterRef('pk'))
+
+        if excluded_author is not None:
+            authors = authors.exclude(pk=excluded_author.pk)
+
+        first_author_name = Subquery(authors.order_by('name').values('name')[:1])
+        primary_author_sort = Coalesce(first_author_name, Value(''))
+
+        return books.exclude(primary_author_sort=primary_author_sort).update(primary_author_sort=primary_author_sort)
+
+    @staticmethod
+    def get_book_authors(books: List[Book], books_authors: List[List[Author]]) -> List[models.Model]:
+        """
+        Rows of the authors through table for the books, where 'books_authors' holds the authors of the book at the
+        same position.
+        """
+        BookAuthor = Book.authors.through
+
+        return [
+            BookAuthor(book_id=book.id, author_id=author_id)
+            for book, authors in zip(books, books_authors)
+            for author_id in dict.fromkeys(author.id for author in authors)
+        ]
+
+
+def get_primary_author_sort(authors: List[Author]) -> str:
+    return min((author.name for author in authors), default='')
+
 
 def strip_and_remove_duplicate_spaces(value: str) -> str:
     """
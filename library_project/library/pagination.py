@@ -1,7 +1,331 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CountMode(models.TextChoices):
+    """
+    How the total number of results is computed, from the most to the least expensive.
+    """
+    EXACT = 'exact'
+    ESTIMATED = 'estimated'
+    NONE = 'none'
+
+
+class CountlessPaginator(Paginator):
+    """
+    Paginator that never counts the results: it fetches one extra row to know whether there is a next page.
+    """
+    # Only known after a page is fetched: the current page number, plus one if there is a next page.
+    num_pages = 1
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+
+        if not rows and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+
+        self.num_pages = number + 1 if len(rows) > self.per_page else number
+
+        return self._get_page(rows[:self.per_page], number, self)
+
+
+class EstimatedCountPaginator(CountlessPaginator):
+    """
+    Paginator whose count is estimated from the planner statistics for unfiltered lists on PostgreSQL, or counted up
+    to 'count_cap' rows otherwise. Pages are still validated without counting, so pages past the cap can be reached.
+    """
+    count_cap = 10000
+
+    @cached_property
+    def estimated_count(self) -> Tuple[int, bool]:
+        return estimate_count(self.object_list, self.count_cap)
+
+    @property
+    def count(self):
+        return self.estimated_count[0]
+
+    @property
+    def count_is_exact(self) -> bool:
+        return self.estimated_count[1]
 
 
 class PageNumberPaginationWithPageSizeControl(PageNumberPagination):
+    """
+    Page number pagination with a page size query parameter and a configurable strategy to count the results.
+
+    The count mode is the 'pagination_count_mode' of the view (exact by default) and clients can choose a cheaper
+    one with the count query parameter, e.g. '?count=none' to omit the count.
+    """
     page_size = 10
     max_page_size = 100
     page_size_query_param = 'page_size'
+
+    count_mode = CountMode.EXACT
+    count_query_param = 'count'
+    count_query_description = _('How to count the results: "exact", "estimated" or "none" to omit the count.')
+
+    paginator_classes = {
+        CountMode.EXACT: Paginator,
+        CountMode.ESTIMATED: EstimatedCountPaginator,
+        CountMode.NONE: CountlessPaginator,
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_mode = self.get_count_mode(request, view)
+        self.django_paginator_class = self.paginator_classes[self.count_mode]
+
+        page_number = request.query_params.get(self.page_query_param)
+        if self.count_mode != CountMode.EXACT and page_number in self.last_page_strings:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=_('The last page is only available with the exact count.')
+            ))
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.count_mode == CountMode.NONE:
+            return Response(OrderedDict([
+                ('next', self.get_next_link()),
+                ('previous', self.get_previous_link()),
+                ('results', data)
+            ]))
+
+        if self.count_mode == CountMode.ESTIMATED:
+            # Tells the estimated and capped counts apart from the exact ones
+            return Response(OrderedDict([
+                ('count', self.page.paginator.count),
+                ('count_is_exact', self.page.paginator.count_is_exact),
+                ('next', self.get_next_link()),
+                ('previous', self.get_previous_link()),
+                ('results', data)
+            ]))
+
+        return super().get_paginated_response(data)
+
+    def get_count_mode(self, request, view) -> str:
+        count_modes = list(CountMode)
+        view_count_mode = getattr(view, 'pagination_count_mode', self.count_mode)
+        requested_count_mode = request.query_params.get(self.count_query_param)
+
+        if requested_count_mode not in count_modes:
+            return view_count_mode
+
+        return max(view_count_mode, requested_count_mode, key=count_modes.index)
+
+    def get_schema_fields(self, view):
+        return super().get_schema_fields(view) + [
+            coreapi.Field(
+                name=self.count_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.Enum(
+                    CountMode.values, title='Count', description=str(self.count_query_description)
+                )
+            )
+        ]
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that pages on the (ordering fields, id) tuple of the last result, so every page is a range
+    query on the ordering instead of an OFFSET, and deep pages cost the same as the first one.
+
+    The ordering is taken from the view's OrderingFilter. Only forward paging is supported.
+    """
+    page_size = 10
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_keyset_ordering(request, queryset, view)
+
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            position = self.clean_position(queryset.model, position)
+            queryset = queryset.filter(get_keyset_filter(self.ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_keyset_ordering(self, request, queryset, view) -> List[str]:
+        ordering = self.get_ordering(request, queryset, view)
+
+        joined_fields = [field for field in ordering if '__' in field]
+        if joined_fields:
+            message = f'Cursor pagination does not support ordering by {", ".join(joined_fields)}.'
+            raise ValidationError({self.cursor_query_param: [message]})
+
+        return [field for field in ordering if field.lstrip('-') not in ('id', 'pk')] + ['id']
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+
+        last_result = self.page[-1]
+        position = [get_field_value(last_result, field.lstrip('-')) for field in self.ordering]
+
+        url = remove_query_param(self.base_url, 'page')
+        return replace_query_param(url, self.cursor_query_param, self.encode_position(position))
+
+    def decode_cursor(self, request) -> Optional[list]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            position = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position
+
+    def clean_position(self, model, position: list) -> list:
+        """
+        Convert the values of a decoded position to the types of their ordering fields, so a tampered cursor is
+        rejected as invalid instead of failing in the query.
+        """
+        values = []
+
+        for field, value in zip(self.ordering, position):
+            model_field = model._meta.get_field(field.lstrip('-'))
+
+            if value is None and not model_field.null:
+                raise NotFound(self.invalid_cursor_message)
+
+            try:
+                values.append(model_field.to_python(value))
+            except (DjangoValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        return values
+
+    @staticmethod
+    def encode_position(position: list) -> str:
+        return b64encode(json.dumps(position, cls=DjangoJSONEncoder).encode('utf-8')).decode('ascii')
+
+
+class PageNumberOrKeysetPagination(PageNumberPaginationWithPageSizeControl):
+    """
+    Page number pagination that switches to keyset pagination when the cursor query parameter is present (empty
+    for the first page), keeping the page number responses for the existing clients.
+    """
+    keyset_pagination_class = KeysetPagination
+
+    keyset_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_paginator = None
+
+        if self.keyset_pagination_class.cursor_query_param in request.query_params:
+            self.keyset_paginator = self.keyset_pagination_class()
+            return self.keyset_paginator.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def get_schema_fields(self, view):
+        fields = super().get_schema_fields(view)
+        cursor_field = self.keyset_pagination_class().get_schema_fields(view)[0]
+
+        return fields + [cursor_field]
+
+
+def get_keyset_filter(ordering: Sequence[str], position: Sequence) -> Q:
+    """
+    Return the condition for the rows that come after 'position' in 'ordering', i.e. for ordering (a, -b, id):
+    a > a0 OR (a = a0 AND b < b0) OR (a = a0 AND b = b0 AND id > id0).
+    """
+    keyset_filter = Q()
+    previous_fields_equal = Q()
+
+    for field, value in zip(ordering, position):
+        field_name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+
+        keyset_filter |= previous_fields_equal & Q(**{f'{field_name}__{lookup}': value})
+        previous_fields_equal &= Q(**{field_name: value})
+
+    return keyset_filter
+
+
+def get_field_value(result, field: str):
+    """
+    Value of the field in a model instance or in a values() row.
+    """
+    if isinstance(result, dict):
+        return result[field]
+
+    return getattr(result, field)
+
+
+def estimate_count(queryset: QuerySet, cap: int) -> Tuple[int, bool]:
+    """
+    Return the number of rows of the queryset, estimated from the planner statistics when it is not filtered and
+    the database is PostgreSQL, or counted up to 'cap' rows otherwise, and whether that number is exact.
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+
+        # The statistics are only trusted for large tables, since they may be missing (-1) or outdated
+        if row is not None and row[0] >= cap:
+            return int(row[0]), False
+
+    count = queryset[:cap].count()
+
+    return count, count < cap
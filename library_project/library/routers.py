@@ -0,0 +1,19 @@
+from rest_framework import routers
+
+
+class BulkRouter(routers.DefaultRouter):
+    """
+    Router that also maps PATCH and DELETE on the list route to the 'bulk_partial_update' and 'bulk_destroy' actions
+    of the viewsets that have them.
+    """
+    routes = [
+        routers.Route(
+            url=route.url,
+            mapping={**route.mapping, 'patch': 'bulk_partial_update', 'delete': 'bulk_destroy'},
+            name=route.name,
+            detail=route.detail,
+            initkwargs=route.initkwargs,
+        )
+        if isinstance(route, routers.Route) and not route.detail else route
+        for route in routers.DefaultRouter.routes
+    ]
@@ -0,0 +1,150 @@
+import sqlite3
+from typing import List
+
+from django.db import connections, migrations
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from library.models import Author, Book
+
+# Tables whose name column is indexed for substring searches.
+SEARCHABLE_TABLES = ['library_author', 'library_book']
+
+# Suffix of the names of the FTS5 tables that shadow the name column of the searchable tables on SQLite.
+SQLITE_SEARCH_TABLE_SUFFIX = '_search'
+
+LIKE_WILDCARDS = ['\\', '%', '_']
+
+
+def sqlite_supports_trigram_search() -> bool:
+    """
+    The trigram tokenizer of FTS5, which allows substring searches, is available since SQLite 3.34.
+    """
+    return sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+def filter_name_contains(queryset: QuerySet, value: str) -> QuerySet:
+    """
+    Filter the authors or books whose name contains 'value', ignoring case, like the 'icontains' lookup does.
+
+    On PostgreSQL 'icontains' is backed by a trigram GIN index on UPPER(name). On SQLite the search goes through an
+    FTS5 table with the trigram tokenizer kept in sync with the model table by triggers.
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'sqlite' and sqlite_supports_trigram_search():
+        table = queryset.model._meta.db_table
+        search_table = table + SQLITE_SEARCH_TABLE_SUFFIX
+        like_sql, like_param = get_sqlite_like_pattern(value)
+
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT id FROM {table} WHERE rowid IN (SELECT rowid FROM {search_table} WHERE name {like_sql})',
+            [like_param],
+        ))
+
+    return queryset.filter(name__icontains=value)
+
+
+def filter_books_by_author_name_contains(queryset: QuerySet, value: str) -> QuerySet:
+    """
+    Filter the books with at least one author whose name contains 'value', ignoring case. The authors are searched
+    through the name index and the books are matched with a subquery, so books with several matching authors are not
+    duplicated.
+    """
+    authors = filter_name_contains(Author.objects.using(queryset.db), value)
+    books_ids = Book.authors.through.objects.filter(author__in=authors).values('book_id')
+
+    return queryset.filter(pk__in=books_ids)
+
+
+def get_sqlite_like_pattern(value: str):
+    """
+    FTS5 only uses the trigram index for LIKE patterns without an ESCAPE clause, so it is only added when the value
+    contains LIKE wildcards.
+    """
+    if not any(wildcard in value for wildcard in LIKE_WILDCARDS):
+        return 'LIKE %s', f'%{value}%'
+
+    for wildcard in LIKE_WILDCARDS:
+        value = value.replace(wildcard, '\\' + wildcard)
+
+    return "LIKE %s ESCAPE '\\'", f'%{value}%'
+
+
+def create_search_indexes(schema_editor):
+    """
+    Create the indexes used by the name searches: a trigram GIN index on UPPER(name) on PostgreSQL, which is what the
+    'icontains' lookup compares, and an FTS5 trigram table kept in sync by triggers on SQLite.
+
+    Used by migrations. On SQLite, migrations that rebuild the searchable tables must drop and create them again.
+    """
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+        for table in SEARCHABLE_TABLES:
+            schema_editor.execute(
+                f'CREATE INDEX {table}_name_upper_trgm ON {table} USING gin (UPPER(name::text) gin_trgm_ops)'
+            )
+    elif vendor == 'sqlite' and sqlite_supports_trigram_search():
+        for table in SEARCHABLE_TABLES:
+            search_table = table + SQLITE_SEARCH_TABLE_SUFFIX
+
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {search_table} "
+                f"USING fts5(name, content='{table}', content_rowid='rowid', tokenize='trigram')"
+            )
+            schema_editor.execute(
+                f'CREATE TRIGGER {search_table}_insert AFTER INSERT ON {table} BEGIN '
+                f'INSERT INTO {search_table}(rowid, name) VALUES (new.rowid, new.name); END'
+            )
+            schema_editor.execute(
+                f'CREATE TRIGGER {search_table}_delete AFTER DELETE ON {table} BEGIN '
+                f"INSERT INTO {search_table}({search_table}, rowid, name) VALUES ('delete', old.rowid, old.name); END"
+            )
+            schema_editor.execute(
+                f'CREATE TRIGGER {search_table}_update AFTER UPDATE OF name ON {table} BEGIN '
+                f"INSERT INTO {search_table}({search_table}, rowid, name) VALUES ('delete', old.rowid, old.name); "
+                f'INSERT INTO {search_table}(rowid, name) VALUES (new.rowid, new.name); END'
+            )
+            schema_editor.execute(f"INSERT INTO {search_table}({search_table}) VALUES ('rebuild')")
+
+
+def drop_search_indexes(schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        for table in SEARCHABLE_TABLES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {table}_name_upper_trgm')
+    elif vendor == 'sqlite':
+        for table in SEARCHABLE_TABLES:
+            search_table = table + SQLITE_SEARCH_TABLE_SUFFIX
+
+            for trigger in ['insert', 'delete', 'update']:
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {search_table}_{trigger}')
+
+            schema_editor.execute(f'DROP TABLE IF EXISTS {search_table}')
+
+
+def drop_sqlite_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        drop_search_indexes(schema_editor)
+
+
+def create_sqlite_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        create_search_indexes(schema_editor)
+
+
+def preserve_sqlite_search_indexes(*operations: migrations.operations.base.Operation) -> List:
+    """
+    Wrap migration operations that rebuild the searchable tables on SQLite, which drops the triggers of their FTS5
+    tables, dropping the search indexes before them and creating them again after them. Other databases alter the
+    tables in place and keep their indexes, so nothing is run for them.
+    """
+    return [
+        migrations.RunPython(drop_sqlite_search_indexes, create_sqlite_search_indexes),
+        *operations,
+        migrations.RunPython(create_sqlite_search_indexes, drop_sqlite_search_indexes),
+    ]
@@ -1,18 +1,202 @@
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.db.models import QuerySet
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from library.models import Author, Book
+from library.sparse import FIELDS_CONTEXT_KEY, RELATED_IDS_CONTEXT_KEY, SparseFieldsSerializerMixin
+from library.utils import parse_uuid
+
+# Maximum number of books written by a single bulk request.
+BULK_MAX_SIZE = 1000
+
+# Key of the serializer context holding the authors already fetched for the request, by id (None for missing ids).
+AUTHORS_BY_ID_CONTEXT_KEY = 'authors_by_id'
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Author
+        fields = ['id', 'name', 'book_count']
+
+
+class BookAuthorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Author
         fields = ['id', 'name']
 
 
+class AuthorsField(serializers.ManyRelatedField):
+    """
+    Ids of the authors of a book. They are fetched with a single query, skipping the authors already fetched for the
+    same request (see get_authors_by_id), and all the missing ids are reported at once.
+    """
+    default_error_messages = {
+        'does_not_exist': 'Invalid pks {pk_values} - objects do not exist.',
+    }
+
+    def __init__(self, **kwargs):
+        super().__init__(child_relation=serializers.PrimaryKeyRelatedField(queryset=Author.objects.all()), **kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        authors_by_id = get_authors_by_id(self.context, data)
+        authors = [authors_by_id.get(parse_uuid(author_id)) for author_id in data]
+
+        missing_ids = [str(author_id) for author_id, author in zip(data, authors) if author is None]
+        if missing_ids:
+            self.fail('does_not_exist', pk_values=', '.join(f'"{author_id}"' for author_id in missing_ids))
+
+        return authors
+
+
+class BookListSerializer(serializers.ListSerializer):
+    """
+    Bulk writes of books. The whole batch is validated before anything is saved, fetching the authors of all the books
+    with a single query, and the errors are reported per item. The books are saved with bulk operations in a single
+    transaction.
+
+    Updates are partial: the instance is the queryset of the books that can be updated and each item must have the
+    'id' of its book.
+    """
+    default_error_messages = {
+        'too_many': 'Ensure this list has no more than {max_size} items.',
+        'book_does_not_exist': 'Book with this id does not exist.',
+        'repeated_book': 'Book repeated in the list.',
+    }
+
+    books_by_id = None
+
+    def __init__(self, *args, **kwargs):
+        # An empty list writes nothing, like the empty bulk delete
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            return super().to_internal_value(data)
+
+        if len(data) > BULK_MAX_SIZE:
+            message = self.error_messages['too_many'].format(max_size=BULK_MAX_SIZE)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code='too_many')
+
+        authors_ids = [
+            author_id
+            for item in data if isinstance(item, dict) and isinstance(item.get('authors'), list)
+            for author_id in item['authors']
+        ]
+        get_authors_by_id(self.context, authors_ids)
+
+        if self.instance is not None:
+            items_ids = [item.get('id') if isinstance(item, dict) else None for item in data]
+            self.books_by_id = get_books_by_id(self.instance, items_ids)
+
+        validated_data = []
+        errors = []
+        seen_books_ids = set()
+
+        for index, item in enumerate(data):
+            item_errors = {}
+
+            if self.instance is not None:
+                book_id = parse_uuid(items_ids[index])
+
+                if book_id not in self.books_by_id:
+                    item_errors['id'] = [self.error_messages['book_does_not_exist']]
+                elif book_id in seen_books_ids:
+                    item_errors['id'] = [self.error_messages['repeated_book']]
+
+                seen_books_ids.add(book_id)
+
+            try:
+                attrs = self.child.run_validation(item)
+            except serializers.ValidationError as exc:
+                item_errors.update(exc.detail)
+            else:
+                if self.instance is not None:
+                    attrs['id'] = book_id
+
+                validated_data.append(attrs)
+
+            errors.append(item_errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return validated_data
+
+    def to_representation(self, books):
+        return books_values_to_representation([
+            {field: getattr(book, field) for field in BookReadSerializer.values_fields} for book in books
+        ])
+
+    def create(self, validated_data):
+        books = []
+        books_authors = []
+
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            books_authors.append(attrs.pop('authors'))
+            books.append(Book(**attrs))
+
+        return Book.bulk_create(books, books_authors)
+
+    def update(self, instance, validated_data):
+        books = []
+        books_authors = []
+        fields = set()
+
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            book = self.books_by_id[attrs.pop('id')]
+            books_authors.append(attrs.pop('authors', None))
+
+            for field, value in attrs.items():
+                setattr(book, field, value)
+                fields.add(field)
+
+            books.append(book)
+
+        return Book.bulk_update(books, sorted(fields), books_authors)
+
+
 class BookSerializer(serializers.ModelSerializer):
+    authors = AuthorsField(allow_empty=False)
+
     class Meta:
         model = Book
         fields = ['id', 'name', 'edition', 'publication_year', 'authors']
+        list_serializer_class = BookListSerializer
+
+    def create(self, validated_data: Dict) -> Book:
+        authors = validated_data.pop('authors')
+
+        book = Book(**validated_data)
+        # The fields were already validated by the serializer
+        book.save(validate=False)
+        book.authors.set(authors)
+
+        return book
+
+    def update(self, book: Book, validated_data: Dict) -> Book:
+        authors = validated_data.pop('authors', None)
+
+        for field, value in validated_data.items():
+            setattr(book, field, value)
+
+        book.save(validate=False)
+
+        if authors is not None:
+            book.authors.set(authors)
+
+        return book
 
     def to_representation(self, book: Book):
         book_representation = super().to_representation(book)
@@ -22,5 +206,129 @@ class BookSerializer(serializers.ModelSerializer):
         return book_representation
 
     def serialize_authors(self, book: Book):
-        serializer = AuthorSerializer(book.authors, many=True)
+        serializer = BookAuthorSerializer(book.authors, many=True)
         return serializer.data
+
+
+def get_authors_by_id(context: Dict, authors_ids: Iterable) -> Dict:
+    """
+    Return the authors fetched for the request by id, with None for the valid ids of missing authors. The ids that
+    were not fetched yet are fetched with a single query and cached in the serializer context, which is shared by all
+    the books of a batch.
+    """
+    authors_by_id = context.setdefault(AUTHORS_BY_ID_CONTEXT_KEY, {})
+    new_ids = {
+        author_id for author_id in map(parse_uuid, authors_ids)
+        if author_id is not None and author_id not in authors_by_id
+    }
+
+    if new_ids:
+        authors_by_id.update(dict.fromkeys(new_ids))
+        authors_by_id.update(Author.objects.in_bulk(new_ids))
+
+    return authors_by_id
+
+
+def get_books_by_id(queryset: QuerySet, books_ids: Sequence) -> Dict:
+    valid_ids = {book_id for book_id in map(parse_uuid, books_ids) if book_id is not None}
+
+    return queryset.prefetch_related(None).in_bulk(valid_ids)
+
+
+def validate_books_ids(queryset: QuerySet, books_ids) -> List:
+    """
+    Validate a list of ids of existing books from the queryset, as sent to the bulk delete, returning the books.
+    The errors are reported per item.
+    """
+    if not isinstance(books_ids, list) or not books_ids:
+        message = 'Expected a non-empty list of book ids.'
+        raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+    if len(books_ids) > BULK_MAX_SIZE:
+        message = BookListSerializer.default_error_messages['too_many'].format(max_size=BULK_MAX_SIZE)
+        raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+    books_by_id = get_books_by_id(queryset, books_ids)
+    errors = [
+        [] if parse_uuid(book_id) in books_by_id else [BookListSerializer.default_error_messages['book_does_not_exist']]
+        for book_id in books_ids
+    ]
+
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+    return list(books_by_id.values())
+
+
+class BookReadListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        return books_values_to_representation(
+            list(data), self.context.get(FIELDS_CONTEXT_KEY), 'authors' in self.context.get(RELATED_IDS_CONTEXT_KEY, [])
+        )
+
+
+class BookReadSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer with the same output of BookSerializer, built from the values() rows of the books (see
+    'values_fields') instead of model instances. The authors of all the serialized books are fetched with a single
+    query, so the books queryset must not prefetch them.
+
+    The fields and the format of the authors requested in the context (see SparseFieldsMixin) are honored, and the
+    authors are not fetched at all when they are not requested.
+    """
+    values_fields = ['id', 'name', 'edition', 'publication_year']
+
+    class Meta:
+        fields = ['id', 'name', 'edition', 'publication_year', 'authors']
+        list_serializer_class = BookReadListSerializer
+
+    def to_representation(self, book: Dict):
+        return books_values_to_representation(
+            [book], self.context.get(FIELDS_CONTEXT_KEY), 'authors' in self.context.get(RELATED_IDS_CONTEXT_KEY, [])
+        )[0]
+
+
+def books_values_to_representation(
+    books: List[Dict], fields: Optional[Sequence[str]] = None, authors_ids_only: bool = False
+) -> List[Dict]:
+    """
+    Return the representation of the books values() rows with the 'fields' (all of them by default), rendering the
+    authors as their ids instead of objects when 'authors_ids_only' is set.
+    """
+    fields = BookReadSerializer.Meta.fields if fields is None else fields
+
+    if 'authors' in fields:
+        authors_by_book_id = get_authors_values_by_book_id((book['id'] for book in books), authors_ids_only)
+
+    representation_by_field = {
+        'id': lambda book: str(book['id']),
+        'authors': lambda book: authors_by_book_id[book['id']],
+    }
+
+    return [
+        OrderedDict(
+            (field, representation_by_field[field](book) if field in representation_by_field else book[field])
+            for field in fields
+        )
+        for book in books
+    ]
+
+
+def get_authors_values_by_book_id(books_ids: Iterable, ids_only: bool = False) -> Dict:
+    """
+    Return the BookAuthorSerializer representation of the authors of each book, in the order they were added to it,
+    or only their ids with 'ids_only', which are read from the through table without joining the authors.
+    """
+    book_authors = Book.authors.through.objects.filter(book_id__in=set(books_ids)).order_by('id')
+    authors_by_book_id = defaultdict(list)
+
+    if ids_only:
+        for book_id, author_id in book_authors.values_list('book_id', 'author_id'):
+            authors_by_book_id[book_id].append(str(author_id))
+
+        return authors_by_book_id
+
+    for book_id, author_id, author_name in book_authors.values_list('book_id', 'author_id', 'author__name'):
+        authors_by_book_id[book_id].append(OrderedDict([('id', str(author_id)), ('name', author_name)]))
+
+    return authors_by_book_id
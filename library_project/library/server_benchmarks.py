@@ -0,0 +1,147 @@
+"""
+Load test of the read endpoints of the API served by gunicorn with its synchronous (WSGI) workers and with uvicorn
+(ASGI) workers, run by the 'benchmark_servers' management command against the configured database.
+"""
+import os
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from django.conf import settings
+
+# Arguments of the gunicorn command serving each interface, besides the number of workers and the address.
+SERVERS = {
+    'wsgi': ['library_project.wsgi'],
+    'asgi': ['--worker-class', 'uvicorn.workers.UvicornWorker', 'library_project.asgi'],
+}
+
+# How long to wait for a server to start answering requests, in seconds.
+SERVER_START_TIMEOUT = 30
+
+REQUEST_TIMEOUT = 30
+
+
+def run_server_benchmarks(
+    servers: Sequence[str], paths: Sequence[Tuple[str, str]], workers: int, concurrency: int, requests: int,
+    port: int, log: Callable[[str], None] = print,
+) -> List[Dict]:
+    """
+    Start each one of the 'servers' with 'workers' processes and send 'requests' requests to each one of the (name,
+    path) 'paths' from 'concurrency' clients at the same time, returning one result per server and path.
+    """
+    results = []
+
+    for server in servers:
+        log(f'Starting {server} server...')
+
+        with run_server(server, workers, port):
+            for name, path in paths:
+                result = load_test(f'http://127.0.0.1:{port}{path}', concurrency, requests)
+                result.update(name=name, server=server)
+                results.append(result)
+
+                log(f'{name} [{server}]: {result["requests_per_second"]:.1f} req/s, p50 {result["p50_ms"]:.2f}ms, '
+                    f'p99 {result["p99_ms"]:.2f}ms, {result["errors"]} errors')
+
+    return results
+
+
+@contextmanager
+def run_server(server: str, workers: int, port: int):
+    """
+    Run gunicorn serving the project with the 'server' interface until the context exits. The responses are not
+    cached, so the requests measure the views and the database.
+    """
+    command = [
+        'gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}', *SERVERS[server],
+    ]
+    env = {**os.environ, 'API_CACHE_TIMEOUT': '0'}
+
+    # A file does not block the server once full, like a pipe that is not read
+    with tempfile.TemporaryFile() as log_file:
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env, stdout=log_file, stderr=log_file)
+
+        try:
+            wait_for_port(port, process, log_file)
+            yield process
+        finally:
+            process.terminate()
+
+            try:
+                process.wait(timeout=SERVER_START_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def wait_for_port(port: int, process: subprocess.Popen, log_file):
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            log_file.seek(0)
+            raise RuntimeError(f'The server exited with code {process.returncode}:\n{log_file.read().decode()}')
+
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+
+    raise RuntimeError(f'The server did not start listening on port {port} in {SERVER_START_TIMEOUT}s.')
+
+
+def load_test(url: str, concurrency: int, requests: int) -> Dict:
+    """
+    Send 'requests' GET requests to the URL from 'concurrency' threads, returning the throughput, the latency
+    percentiles of the successful requests and the number of failed ones.
+    """
+    def send_request(_) -> Tuple[float, bool]:
+        start = time.perf_counter()
+
+        try:
+            with urllib.request.urlopen(url, timeout=REQUEST_TIMEOUT) as response:
+                response.read()
+                success = response.status == 200
+        except (urllib.error.URLError, OSError):
+            success = False
+
+        return time.perf_counter() - start, success
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        responses = list(executor.map(send_request, range(requests)))
+
+    elapsed = time.perf_counter() - start
+    latencies = sorted(duration for duration, success in responses if success)
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': requests - len(latencies),
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': get_percentile(latencies, 50) * 1000,
+        'p95_ms': get_percentile(latencies, 95) * 1000,
+        'p99_ms': get_percentile(latencies, 99) * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000 if latencies else 0,
+    }
+
+
+def get_percentile(sorted_values: Sequence[float], percentile: float) -> float:
+    """
+    Nearest-rank percentile of the sorted values, 0 when there are none.
+    """
+    if not sorted_values:
+        return 0
+
+    rank = max(int(round(percentile / 100 * len(sorted_values))), 1)
+
+    return sorted_values[rank - 1]
@@ -0,0 +1,138 @@
+import threading
+from typing import Iterable, Set
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from library import cache
+from library.models import Author, Book
+from library.utils import batched
+
+# Ids of the rows to update once the rows being deleted are gone, collected by the pre_delete receivers of the current
+# thread. A delete sends the pre_delete signals of all its rows before deleting any of them and their post_delete
+# signals after deleting all of them, so the first post_delete receiver updates the rows of the whole delete at once.
+pending_updates = threading.local()
+
+BOOKS_OF_DELETED_AUTHORS = 'books_of_deleted_authors'
+AUTHORS_OF_DELETED_BOOKS = 'authors_of_deleted_books'
+
+# Maximum number of ids of each update of the rows affected by a delete.
+PENDING_UPDATE_BATCH_SIZE = 500
+
+
+def add_pending_ids(key: str, ids: Iterable):
+    if not hasattr(pending_updates, key):
+        setattr(pending_updates, key, set())
+
+    getattr(pending_updates, key).update(ids)
+
+
+def pop_pending_ids(key: str) -> Set:
+    ids = getattr(pending_updates, key, set())
+    setattr(pending_updates, key, set())
+
+    return ids
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_author_responses(sender, **kwargs):
+    # The books responses embed their authors
+    cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
+
+
+@receiver(post_save, sender=Book)
+def invalidate_book_responses(sender, **kwargs):
+    cache.invalidate([cache.BOOKS_RESOURCE])
+
+
+@receiver(post_delete, sender=Book)
+def invalidate_deleted_book_responses(sender, **kwargs):
+    # The authors responses embed their book counts
+    cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def invalidate_book_authors_responses(sender, action, **kwargs):
+    if action.startswith('post_'):
+        cache.invalidate([cache.AUTHORS_RESOURCE, cache.BOOKS_RESOURCE])
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def touch_books_with_changed_authors(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep the 'updated_at' of the books in sync with their authors list, since it is what the ETag and Last-Modified
+    headers of the books responses are computed from.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        books = Book.objects.filter(pk=instance.pk)
+    elif action == 'pre_clear':
+        books = Book.objects.filter(authors=instance)
+    else:
+        books = Book.objects.filter(pk__in=pk_set)
+
+    books.update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def update_primary_author_sort_of_books_with_changed_authors(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # The books of the author are only known before the clear
+        Book.update_primary_author_sort(Book.objects.filter(authors=instance), excluded_author=instance)
+    elif reverse and action in ('post_add', 'post_remove'):
+        Book.update_primary_author_sort(Book.objects.filter(pk__in=pk_set))
+    elif not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        Book.update_primary_author_sort(Book.objects.filter(pk=instance.pk))
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def update_book_count_of_authors_with_changed_books(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse and action == 'pre_clear':
+        # The authors of the book are only known before the clear
+        Author.update_book_count(Author.objects.filter(books=instance), excluded_book=instance)
+    elif not reverse and action in ('post_add', 'post_remove'):
+        Author.update_book_count(Author.objects.filter(pk__in=pk_set))
+    elif reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        Author.update_book_count(Author.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Author)
+def update_primary_author_sort_of_renamed_author_books(sender, instance, created, **kwargs):
+    if not created:
+        books = Book.objects.filter(authors=instance)
+
+        # The books responses embed the names of their authors
+        books.update(updated_at=timezone.now())
+        Book.update_primary_author_sort(books)
+
+
+@receiver(pre_delete, sender=Author)
+def collect_books_of_deleted_author(sender, instance, **kwargs):
+    # The through table rows are deleted without sending m2m_changed, so the books are only known before the delete
+    add_pending_ids(BOOKS_OF_DELETED_AUTHORS, Book.objects.filter(authors=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Author)
+def update_books_of_deleted_authors(sender, **kwargs):
+    for books_ids in batched(pop_pending_ids(BOOKS_OF_DELETED_AUTHORS), PENDING_UPDATE_BATCH_SIZE):
+        books = Book.objects.filter(pk__in=books_ids)
+
+        books.update(updated_at=timezone.now())
+        Book.update_primary_author_sort(books)
+
+
+@receiver(pre_delete, sender=Book)
+def collect_authors_of_deleted_book(sender, instance, **kwargs):
+    # The through table rows are deleted without sending m2m_changed, so the authors are only known before the delete.
+    # They are read from the prefetched authors of the deleted books when the deleted queryset prefetches them.
+    add_pending_ids(AUTHORS_OF_DELETED_BOOKS, (author.pk for author in instance.authors.all()))
+
+
+@receiver(post_delete, sender=Book)
+def update_book_count_of_deleted_books_authors(sender, **kwargs):
+    for authors_ids in batched(pop_pending_ids(AUTHORS_OF_DELETED_BOOKS), PENDING_UPDATE_BATCH_SIZE):
+        Author.update_book_count(Author.objects.filter(pk__in=authors_ids))
@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+from django.db.models import QuerySet
+from django.db.models.query import ValuesIterable
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+FIELDS_QUERY_PARAM = 'fields'
+
+# Value of the query parameter named after a related field (e.g. '?authors=ids') that renders the ids of the related
+# objects instead of the embedded objects.
+RELATED_IDS = 'ids'
+RELATED_EXPAND = 'expand'
+
+# Keys of the serializer context with the requested fields (None for all of them) and the related fields requested as
+# ids.
+FIELDS_CONTEXT_KEY = 'fields'
+RELATED_IDS_CONTEXT_KEY = 'related_ids_fields'
+
+
+def parse_fields(value: Optional[str], available_fields: Sequence[str]) -> Optional[List[str]]:
+    """
+    Return the fields of a comma separated 'fields' query parameter value in the order of 'available_fields', or
+    None when the parameter is missing or empty, which means all the fields.
+    """
+    if not value:
+        return None
+
+    fields = {field.strip() for field in value.split(',') if field.strip()}
+    unknown_fields = sorted(fields.difference(available_fields))
+
+    if unknown_fields:
+        message = f'Unknown fields: {", ".join(unknown_fields)}. Valid fields: {", ".join(available_fields)}.'
+        raise ValidationError({FIELDS_QUERY_PARAM: [message]})
+
+    return [field for field in available_fields if field in fields] or None
+
+
+class SparseFieldsMixin:
+    """
+    Let the clients of the 'sparse_fields_actions' of a viewset choose the fields of the responses with the 'fields'
+    query parameter (e.g. '?fields=id,name'), among the fields of the serializer, and render each one of the
+    'related_ids_fields' as the ids of the related objects instead of the embedded objects when the query parameter
+    named after it is 'ids' (e.g. '?authors=ids').
+
+    The serializers get the choices from their context and SparseFieldsFilter drops the columns that are not needed
+    from the queryset.
+    """
+    sparse_fields_actions = ['list', 'retrieve']
+    related_ids_fields = []
+
+    def get_sparse_fields(self) -> Optional[List[str]]:
+        """
+        The fields requested for the response, or None for all of them.
+        """
+        if self.action not in self.sparse_fields_actions:
+            return None
+
+        serializer_fields = self.get_serializer_class().Meta.fields
+
+        return parse_fields(self.request.query_params.get(FIELDS_QUERY_PARAM), serializer_fields)
+
+    def get_related_ids_fields(self) -> List[str]:
+        """
+        The related fields requested as ids.
+        """
+        if self.action not in self.sparse_fields_actions:
+            return []
+
+        related_ids_fields = []
+
+        for field in self.related_ids_fields:
+            value = self.request.query_params.get(field, RELATED_EXPAND)
+
+            if value not in (RELATED_EXPAND, RELATED_IDS):
+                raise ValidationError({field: [f'Must be "{RELATED_EXPAND}" or "{RELATED_IDS}".']})
+
+            if value == RELATED_IDS:
+                related_ids_fields.append(field)
+
+        return related_ids_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context[FIELDS_CONTEXT_KEY] = self.get_sparse_fields()
+        context[RELATED_IDS_CONTEXT_KEY] = self.get_related_ids_fields()
+
+        return context
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Model serializer that only has the fields requested in its context (see SparseFieldsMixin).
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested_fields = self.context.get(FIELDS_CONTEXT_KEY)
+
+        if requested_fields is None:
+            return fields
+
+        return OrderedDict((name, field) for name, field in fields.items() if name in requested_fields)
+
+
+class SparseFieldsFilter(BaseFilterBackend):
+    """
+    Fetch only the columns of the fields requested with the 'fields' query parameter, besides the id and the ordering
+    fields that the pagination reads from the rows. It must run after the ordering filter.
+
+    It narrows the fields of values() querysets and defers the other columns of model querysets with only().
+    """
+
+    def filter_queryset(self, request, queryset: QuerySet, view):
+        fields = view.get_sparse_fields()
+
+        if fields is None:
+            return queryset
+
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        ordering_fields = [field.lstrip('-') for field in queryset.query.order_by if isinstance(field, str)]
+        columns = list(OrderedDict.fromkeys(
+            field for field in ['id', *fields, *ordering_fields] if field in model_fields
+        ))
+
+        if issubclass(queryset._iterable_class, ValuesIterable):
+            return queryset.values(*columns)
+
+        return queryset.only(*columns)
+
+    def get_schema_fields(self, view):
+        assert coreapi is not None, 'coreapi must be installed to use `get_schema_fields()`'
+        assert coreschema is not None, 'coreschema must be installed to use `get_schema_fields()`'
+
+        schema_fields = [
+            coreapi.Field(
+                name=FIELDS_QUERY_PARAM,
+                required=False,
+                location='query',
+                schema=coreschema.String(
+                    title='Fields',
+                    description='Comma separated fields of the results, all of them by default.',
+                ),
+            ),
+        ]
+
+        for field in getattr(view, 'related_ids_fields', []):
+            schema_fields.append(coreapi.Field(
+                name=field,
+                required=False,
+                location='query',
+                schema=coreschema.Enum(
+                    [RELATED_EXPAND, RELATED_IDS], title=field.capitalize(),
+                    description=f'Embed the {field} ("{RELATED_EXPAND}", the default) or render their ids ("ids").',
+                ),
+            ))
+
+        return schema_fields
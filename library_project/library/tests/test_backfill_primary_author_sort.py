@@ -0,0 +1,51 @@
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from library import cache
+from library.models import Book
+
+
+class BackfillPrimaryAuthorSortTest(TestCase):
+    fixtures = ['test_data']
+
+    def call_backfill_command(self, *options):
+        stdout = StringIO()
+        call_command('backfill_primary_author_sort', *options, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_backfill(self):
+        Book.objects.update(primary_author_sort='')
+
+        self.call_backfill_command('--batch-size', '2')
+
+        for book in Book.objects.prefetch_related('authors'):
+            with self.subTest(book=book):
+                self.assertEqual(book.primary_author_sort, min(author.name for author in book.authors.all()))
+
+    def test_backfill_only_updates_the_changed_books(self):
+        Book.objects.filter(pk=Book.objects.first().pk).update(primary_author_sort='')
+
+        self.assertIn('1 book updated.', self.call_backfill_command())
+        self.assertIn('0 books updated.', self.call_backfill_command())
+
+    def test_backfill_invalidates_the_cached_books(self):
+        Book.objects.update(primary_author_sort='')
+        version = cache.get_version(cache.BOOKS_RESOURCE)
+
+        self.call_backfill_command()
+
+        self.assertGreater(cache.get_version(cache.BOOKS_RESOURCE), version)
+
+    def test_backfill_without_changes_keeps_the_cached_books(self):
+        version = cache.get_version(cache.BOOKS_RESOURCE)
+
+        self.call_backfill_command()
+
+        self.assertEqual(cache.get_version(cache.BOOKS_RESOURCE), version)
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(CommandError):
+            self.call_backfill_command('--batch-size', '0')
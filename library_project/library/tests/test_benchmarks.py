@@ -0,0 +1,78 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from library import benchmarks
+from library.models import Author, Book
+
+
+class BenchmarksTest(TestCase):
+
+    def test_measure_rolls_back_writes(self):
+        def create_author():
+            Author.objects.create(name='Benchmark Author')
+            return 1
+
+        result = benchmarks.measure(create_author, repeat=3)
+
+        self.assertFalse(Author.objects.exists())
+        self.assertGreater(result['median_ms'], 0)
+        self.assertGreaterEqual(result['median_ms'], result['min_ms'])
+        self.assertGreater(result['peak_memory_kb'], 0)
+        self.assertIn('items_per_second', result)
+
+    def test_measure_counts_queries(self):
+        def list_authors():
+            list(Author.objects.all())
+
+        result = benchmarks.measure(list_authors, repeat=1)
+
+        self.assertEqual(result['queries'], 1)
+        self.assertNotIn('items_per_second', result)
+
+    @mock.patch.object(benchmarks, 'IMPORT_AUTHORS_SIZE', 10)
+    @mock.patch.object(benchmarks, 'INSERT_IDS_SIZE', 10)
+    def test_run_benchmarks(self):
+        results = benchmarks.run_benchmarks([20], repeat=1, log=lambda message: None)
+
+        benchmarks_names = [result['name'] for result in results]
+
+        self.assertIn('books.list', benchmarks_names)
+        self.assertIn('import_authors', benchmarks_names)
+        self.assertIn('insert.time_ordered_ids', benchmarks_names)
+        self.assertEqual(Book.objects.count(), 20)
+
+        for result in results:
+            with self.subTest(benchmark=result['name']):
+                self.assertEqual(result['size'], 20)
+                self.assertGreater(result['queries'], 0)
+
+        insert_result = next(result for result in results if result['name'] == 'insert.time_ordered_ids')
+
+        self.assertGreater(insert_result['items_per_second'], 0)
+        self.assertIn('index_growth_kb', insert_result)
+
+    def test_compare_results(self):
+        baseline = [
+            {'name': 'books.list', 'size': 10, 'median_ms': 10, 'queries': 3},
+            {'name': 'authors.list', 'size': 10, 'median_ms': 10, 'queries': 3},
+            {'name': 'books.retrieve', 'size': 10, 'median_ms': 10, 'queries': 3},
+        ]
+        results = [
+            {'name': 'books.list', 'size': 10, 'median_ms': 11, 'queries': 3},
+            {'name': 'authors.list', 'size': 10, 'median_ms': 13, 'queries': 3},
+            {'name': 'books.retrieve', 'size': 10, 'median_ms': 5, 'queries': 4},
+            {'name': 'books.create', 'size': 10, 'median_ms': 50, 'queries': 10},
+        ]
+
+        regressions = benchmarks.compare_results(results, baseline, threshold=0.2)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('authors.list [10]'))
+        self.assertTrue(regressions[1].startswith('books.retrieve [10]'))
+
+    def test_invalid_repeat(self):
+        with self.assertRaisesMessage(CommandError, '--repeat must be a positive integer.'):
+            call_command('benchmark', '--repeat', '0', stdout=StringIO())
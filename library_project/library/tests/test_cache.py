@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.response import Response
+
+from library import cache as response_cache
+
+
+class GetOrComputeResponseTest(TestCase):
+    key = 'test:response'
+
+    def setUp(self):
+        cache.clear()
+
+    def test_computes_once(self):
+        compute = mock.Mock(return_value=Response({'value': 1}))
+
+        first_response = response_cache.get_or_compute_response(self.key, compute, timeout=60)
+        second_response = response_cache.get_or_compute_response(self.key, compute, timeout=60)
+
+        compute.assert_called_once()
+        self.assertEqual(first_response.data, second_response.data)
+        self.assertEqual(second_response['X-Cache'], 'HIT')
+
+    def test_caches_the_etag(self):
+        compute = mock.Mock(return_value=Response({'value': 1}, headers={'ETag': '"etag"'}))
+
+        response_cache.get_or_compute_response(self.key, compute, timeout=60)
+        cached_response = response_cache.get_or_compute_response(self.key, compute, timeout=60)
+
+        self.assertEqual(cached_response['X-Cache'], 'HIT')
+        self.assertEqual(cached_response['ETag'], '"etag"')
+
+    def test_errors_are_not_cached(self):
+        compute = mock.Mock(return_value=Response({'detail': 'error'}, status=400))
+
+        response_cache.get_or_compute_response(self.key, compute, timeout=60)
+        response_cache.get_or_compute_response(self.key, compute, timeout=60)
+
+        self.assertEqual(compute.call_count, 2)
+
+    def test_waits_for_the_request_holding_the_lock(self):
+        cache.add(f'{self.key}:lock', True)
+
+        def cache_response_while_waiting(seconds):
+            cache.set(self.key, (200, {'value': 'from other request'}, {}))
+
+        compute = mock.Mock(return_value=Response({'value': 'computed'}))
+
+        with mock.patch('library.cache.time.sleep', side_effect=cache_response_while_waiting):
+            response = response_cache.get_or_compute_response(self.key, compute, timeout=60)
+
+        compute.assert_not_called()
+        self.assertEqual(response.data, {'value': 'from other request'})
+
+    def test_computes_when_lock_is_released_without_response(self):
+        cache.add(f'{self.key}:lock', True)
+
+        def release_lock(seconds):
+            cache.delete(f'{self.key}:lock')
+
+        compute = mock.Mock(return_value=Response({'value': 'computed'}))
+
+        with mock.patch('library.cache.time.sleep', side_effect=release_lock):
+            response = response_cache.get_or_compute_response(self.key, compute, timeout=60)
+
+        compute.assert_called_once()
+        self.assertEqual(response.data, {'value': 'computed'})
+
+
+class InvalidateTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidate_bumps_versions(self):
+        authors_version = response_cache.get_version(response_cache.AUTHORS_RESOURCE)
+        books_version = response_cache.get_version(response_cache.BOOKS_RESOURCE)
+
+        response_cache.invalidate([response_cache.BOOKS_RESOURCE])
+
+        self.assertEqual(response_cache.get_version(response_cache.AUTHORS_RESOURCE), authors_version)
+        self.assertGreater(response_cache.get_version(response_cache.BOOKS_RESOURCE), books_version)
@@ -0,0 +1,91 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from library.management.commands import explain_queries
+from library.views import BookViewSet
+
+
+class ExplainQueriesTest(TestCase):
+
+    def call_explain_command(self, *options):
+        stdout = StringIO()
+        call_command('explain_queries', *options, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_explain(self):
+        call_command('generate_catalog', authors=10, books=50, stdout=StringIO())
+
+        output = self.call_explain_command('-v', '2')
+
+        self.assertRegex(output, r'\d+ queries explained, \d+ with sequential scans\.')
+        self.assertIn('books [edition=', output)
+        self.assertIn('authors [ordering=-book_count, cursor=]', output)
+        self.assertIn('authors [ordering=-book_count, count=exact]', output)
+        self.assertIn('authors [ordering=-book_count, count=estimated]', output)
+        self.assertNotIn('cursor=, count=', output)
+        self.assertIn('authors [ordering=-book_count, cursor=] validators', output)
+
+    def test_validators_queries(self):
+        call_command('generate_catalog', authors=5, books=10, stdout=StringIO())
+
+        validators_queries = explain_queries.get_validators_queries(BookViewSet, {'edition': 1})
+
+        self.assertEqual(len(validators_queries), 1)
+        self.assertIn('MAX(', validators_queries[0][0])
+
+    def test_count_queries(self):
+        call_command('generate_catalog', authors=5, books=10, stdout=StringIO())
+
+        count_queries = list(explain_queries.get_count_queries(BookViewSet, {'edition': 1}))
+
+        self.assertListEqual([count_mode for count_mode, sql, params in count_queries], ['exact', 'estimated'])
+
+        for count_mode, sql, params in count_queries:
+            with self.subTest(count_mode=count_mode):
+                self.assertIn('COUNT(', sql)
+                self.assertIn('library_book', explain_queries.explain_sql(sql, params))
+
+    def test_check_fails_with_sequential_scans(self):
+        call_command('generate_catalog', authors=5, books=10, stdout=StringIO())
+
+        with mock.patch.object(explain_queries, 'find_seq_scans', return_value=['library_book']):
+            with self.assertRaisesMessage(CommandError, 'with sequential scans'):
+                self.call_explain_command('--check')
+
+    def test_empty_database(self):
+        with self.assertRaisesMessage(CommandError, 'generate_catalog'):
+            self.call_explain_command()
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(CommandError):
+            self.call_explain_command('--page-size', '0')
+
+    def test_query_params_combinations(self):
+        combinations = list(explain_queries.get_query_params_combinations(
+            BookViewSet, {'edition': 1, 'publication_year': 2000}
+        ))
+
+        # 4 subsets of filters, 9 orderings (the default and both directions of 4 fields) and 2 paginations
+        self.assertEqual(len(combinations), 4 * 9 * 2)
+        self.assertIn(
+            {'edition': 1, 'publication_year': 2000, 'ordering': '-authors__name', 'cursor': ''}, combinations
+        )
+        self.assertIn({}, combinations)
+
+    def test_find_seq_scans(self):
+        plans = [
+            ('sqlite', '2 0 0 SCAN TABLE library_book\n9 0 0 SEARCH library_author USING INDEX i', ['library_book']),
+            ('sqlite', '5 0 0 SCAN library_book USING INDEX library_boo_name_45231e_idx', []),
+            ('sqlite', '17 15 0 SCAN library_author_search VIRTUAL TABLE INDEX 0:L0\n20 0 0 SCAN CONSTANT ROW', []),
+            ('sqlite', '2 0 0 CO-ROUTINE subquery\n7 2 0 SCAN library_author USING INDEX i\n16 0 0 SCAN subquery', []),
+            ('postgresql', 'Limit\n  ->  Seq Scan on library_book\n  ->  Seq Scan on library_book', ['library_book']),
+            ('postgresql', 'Limit\n  ->  Index Scan using library_boo_name_45231e_idx on library_book', []),
+        ]
+
+        for vendor, plan, tables in plans:
+            with self.subTest(plan=plan), mock.patch.object(explain_queries.connection, 'vendor', vendor):
+                self.assertListEqual(explain_queries.find_seq_scans(plan), tables)
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.db.models import Count
+from django.test import TestCase
+
+from library.management.commands.generate_catalog import get_author_name
+from library.models import Author, Book
+
+
+class GenerateCatalogTest(TestCase):
+
+    def call_generate_catalog_command(self, *options):
+        call_command('generate_catalog', *options, stdout=StringIO())
+
+    def get_books_rows(self):
+        return list(Book.objects.order_by('id').values_list('id', 'name', 'edition', 'publication_year'))
+
+    def test_generate_catalog(self):
+        self.call_generate_catalog_command(
+            '--authors', '50', '--books', '120', '--authors-per-book', '1:1,3:1', '--batch-size', '40'
+        )
+
+        self.assertEqual(Author.objects.count(), 50)
+        self.assertEqual(Book.objects.count(), 120)
+
+        for book in Book.objects.prefetch_related('authors'):
+            with self.subTest(book=book):
+                authors_names = [author.name for author in book.authors.all()]
+
+                self.assertIn(len(authors_names), [1, 3])
+                self.assertEqual(book.primary_author_sort, min(authors_names))
+                book.full_clean()
+
+        for author in Author.objects.annotate(actual_book_count=Count('books')):
+            with self.subTest(author=author):
+                self.assertEqual(author.book_count, author.actual_book_count)
+
+    def test_same_seed_generates_same_catalog(self):
+        self.call_generate_catalog_command('--authors', '10', '--books', '20', '--seed', '7')
+        books_rows = self.get_books_rows()
+
+        self.call_generate_catalog_command('--authors', '10', '--books', '20', '--seed', '7', '--clear')
+        self.assertListEqual(self.get_books_rows(), books_rows)
+
+        self.call_generate_catalog_command('--authors', '10', '--books', '20', '--seed', '8', '--clear')
+        self.assertNotEqual(self.get_books_rows(), books_rows)
+
+    def test_authors_names_are_unique(self):
+        names = [get_author_name(index) for index in range(100000)]
+
+        self.assertEqual(len(set(names)), len(names))
+
+    def test_catalogs_of_different_seeds(self):
+        self.call_generate_catalog_command('--authors', '10', '--books', '20')
+        self.call_generate_catalog_command('--authors', '10', '--books', '20', '--seed', '1')
+
+        self.assertEqual(Author.objects.count(), 20)
+        self.assertEqual(Book.objects.count(), 40)
+
+        with self.assertRaisesMessage(CommandError, '--clear'):
+            self.call_generate_catalog_command('--authors', '10', '--books', '20', '--seed', '1')
+
+        self.assertEqual(Author.objects.count(), 20)
+
+    def test_conflicting_author_name(self):
+        Author.objects.create(name=get_author_name(3))
+
+        with self.assertRaisesMessage(CommandError, 'conflicts with the existing authors or books'):
+            self.call_generate_catalog_command('--authors', '10', '--books', '20')
+
+    def test_invalid_options(self):
+        invalid_options = [
+            ['--authors', '-1'],
+            ['--authors', '0', '--books', '1'],
+            ['--authors-per-book', '0:1'],
+            ['--authors-per-book', '1:0'],
+            ['--authors-per-book', 'one'],
+            ['--batch-size', '0'],
+        ]
+
+        for options in invalid_options:
+            with self.subTest(options=options):
+                with self.assertRaises(CommandError):
+                    self.call_generate_catalog_command(*options)
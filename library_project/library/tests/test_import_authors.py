@@ -3,6 +3,7 @@ import os
 import csv
 import tempfile
 from typing import List
+from unittest import mock
 
 from django.core.management import call_command, CommandError
 from django.test import TestCase
@@ -34,11 +35,11 @@ class ImportAuthorsTest(TestCase):
 
         self.csvfile.close()
 
-    def call_import_authors_command(self, filename=None):
+    def call_import_authors_command(self, filename=None, *options):
         if filename is None:
             filename = self.filename
 
-        command_args = [filename]
+        command_args = [filename, *options]
 
         call_command('import_authors', *command_args, stdout=StringIO())
 
@@ -100,3 +101,108 @@ class ImportAuthorsTest(TestCase):
             self.call_import_authors_command('nonexistent_file.csv')
 
         self.assertEqual(self.authors.count(), 0)
+
+    def test_import_in_batches(self):
+        author_names = ['William Shakespeare', 'William Faulkner', 'Jane Austen', 'Henry James', 'Leo Tolstoy']
+
+        self.write_content_to_file(author_names)
+        self.call_import_authors_command(None, '--batch-size', '2', '--commit-every', '2')
+
+        self.assertEqual(self.authors.count(), len(author_names))
+        self.assertCountEqual(self.authors_as_names_list(), author_names)
+
+    def test_import_in_batches_keeps_committed_batches_on_error(self):
+        author_names = ['William Shakespeare', 'William Faulkner', 'Jane Austen', 'William Shakespeare']
+
+        self.write_content_to_file(author_names)
+
+        with self.assertRaises(CommandError):
+            self.call_import_authors_command(None, '--batch-size', '1', '--commit-every', '2')
+
+        self.assertCountEqual(self.authors_as_names_list(), ['William Shakespeare', 'William Faulkner'])
+
+    def test_import_in_batches_single_transaction_by_default(self):
+        author_names = ['William Shakespeare', 'William Faulkner', 'William Shakespeare']
+
+        self.write_content_to_file(author_names)
+
+        with self.assertRaises(CommandError):
+            self.call_import_authors_command(None, '--batch-size', '1')
+
+        self.assertEqual(self.authors.count(), 0)
+
+    def test_invalid_batch_options(self):
+        self.write_content_to_file(['William Shakespeare'])
+
+        for option in ['--batch-size', '--commit-every']:
+            with self.subTest(option=option):
+                with self.assertRaises(CommandError):
+                    self.call_import_authors_command(None, option, '0')
+
+        self.assertEqual(self.authors.count(), 0)
+
+    def test_reimport_same_file_skipping_existing(self):
+        author_names = ['William Shakespeare', 'William Faulkner', 'Jane Austen']
+
+        self.write_content_to_file(author_names)
+
+        self.call_import_authors_command()
+        self.call_import_authors_command(None, '--on-conflict', 'skip')
+
+        self.assertEqual(self.authors.count(), len(author_names))
+
+    def test_reimport_same_file_updating_existing(self):
+        author_names = ['William Shakespeare', 'William Faulkner']
+
+        self.write_content_to_file(author_names)
+
+        self.call_import_authors_command()
+        updated_at_before = {author.name: author.updated_at for author in self.authors.all()}
+
+        self.call_import_authors_command(None, '--on-conflict', 'update')
+
+        self.assertEqual(self.authors.count(), len(author_names))
+
+        for author in self.authors.all():
+            self.assertGreater(author.updated_at, updated_at_before[author.name])
+
+    def test_file_with_repeated_names(self):
+        author_names = ['William Shakespeare', ' William   Shakespeare ', 'Jane Austen']
+
+        self.write_content_to_file(author_names)
+
+        with self.assertRaises(CommandError):
+            self.call_import_authors_command()
+
+        self.assertEqual(self.authors.count(), 0)
+
+        self.call_import_authors_command(None, '--on-conflict', 'skip', '--batch-size', '1')
+
+        self.assertCountEqual(self.authors_as_names_list(), ['William Shakespeare', 'Jane Austen'])
+
+    @mock.patch('library.management.commands.import_authors.WORKER_RANGE_SIZE', 16)
+    def test_import_with_workers(self):
+        author_names = ['William Shakespeare', '', '  Jane   Austen ', 'Henry James', 'Leo Tolstoy', 'Homer']
+
+        self.write_content_to_file(author_names)
+        self.call_import_authors_command(None, '--workers', '2', '--batch-size', '2')
+
+        expected_names = ['William Shakespeare', 'Jane Austen', 'Henry James', 'Leo Tolstoy', 'Homer']
+
+        self.assertCountEqual(self.authors_as_names_list(), expected_names)
+
+    def test_import_with_workers_invalid_content(self):
+        self.write_content_to_file(['William Shakespeare', ' ', 'a' * 101])
+
+        with self.assertRaises(CommandError):
+            self.call_import_authors_command(None, '--workers', '2')
+
+        self.assertEqual(self.authors.count(), 0)
+
+    def test_import_with_workers_invalid_header_column_name(self):
+        self.write_content_to_file(['William Shakespeare'], header_column='wrong')
+
+        with self.assertRaises(CommandError):
+            self.call_import_authors_command(None, '--workers', '2')
+
+        self.assertEqual(self.authors.count(), 0)
@@ -0,0 +1,161 @@
+from io import StringIO
+import os
+import csv
+import json
+import tempfile
+from typing import Dict, List
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from library.models import Author, Book
+
+
+class ImportBooksTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Author.bulk_create(['William Shakespeare', 'Jane Austen', 'Neil Gaiman', 'Terry Pratchett'])
+
+    def setUp(self):
+        self.books = Book.objects.all()
+        self.files = []
+
+    def tearDown(self):
+        for filename in self.files:
+            os.unlink(filename)
+
+    def create_file(self, suffix: str) -> tempfile.NamedTemporaryFile:
+        file = tempfile.NamedTemporaryFile(mode='w', suffix=suffix, delete=False, newline='')
+        self.files.append(file.name)
+
+        return file
+
+    def write_csv_file(self, books: List[Dict], header=None) -> str:
+        if header is None:
+            header = ['name', 'edition', 'publication_year', 'authors']
+
+        with self.create_file('.csv') as file:
+            writer = csv.DictWriter(file, fieldnames=header)
+            writer.writeheader()
+
+            for book in books:
+                row = dict(book)
+
+                if 'authors' in row:
+                    row['authors'] = ';'.join(row['authors'])
+
+                writer.writerow(row)
+
+        return file.name
+
+    def write_ndjson_file(self, books: List[Dict]) -> str:
+        with self.create_file('.ndjson') as file:
+            for book in books:
+                file.write(json.dumps(book) + '\n')
+
+        return file.name
+
+    def call_import_books_command(self, filename, *options):
+        call_command('import_books', filename, *options, stdout=StringIO())
+
+    def test_empty_file(self):
+        self.call_import_books_command(self.write_csv_file([]))
+
+        self.assertEqual(self.books.count(), 0)
+
+    def test_csv_file_with_valid_content(self):
+        books = [
+            {'name': 'Hamlet', 'edition': 1, 'publication_year': 1603, 'authors': ['William Shakespeare']},
+            {
+                'name': 'Good Omens',
+                'edition': 2,
+                'publication_year': 1990,
+                'authors': ['Neil Gaiman', 'Terry Pratchett'],
+            },
+        ]
+
+        self.call_import_books_command(self.write_csv_file(books), '--batch-size', '1')
+
+        self.assertEqual(self.books.count(), len(books))
+
+        good_omens = self.books.get(name='Good Omens')
+        self.assertEqual(good_omens.edition, 2)
+        self.assertEqual(good_omens.publication_year, 1990)
+        good_omens_authors = [author.name for author in good_omens.authors.all()]
+        self.assertCountEqual(good_omens_authors, ['Neil Gaiman', 'Terry Pratchett'])
+
+    def test_ndjson_file_with_valid_content(self):
+        books = [
+            {'name': ' Emma ', 'edition': 1, 'publication_year': 1815, 'authors': ['Jane   Austen']},
+            {'name': 'Persuasion', 'edition': 1, 'publication_year': 1817, 'authors': ['Jane Austen', 'Jane Austen']},
+        ]
+
+        self.call_import_books_command(self.write_ndjson_file(books))
+
+        self.assertCountEqual([book.name for book in self.books], ['Emma', 'Persuasion'])
+
+        for book in self.books:
+            self.assertListEqual([author.name for author in book.authors.all()], ['Jane Austen'])
+
+    def test_invalid_books(self):
+        books = [
+            {'name': 'Hamlet', 'edition': 1, 'publication_year': 1603, 'authors': ['William Shakespeare']},
+            {'name': '', 'edition': 0, 'publication_year': 3000, 'authors': []},
+            {'name': 'Unknown', 'edition': 1, 'publication_year': 2000, 'authors': ['Nonexistent Author']},
+        ]
+
+        for filename in [self.write_csv_file(books), self.write_ndjson_file(books)]:
+            with self.subTest(filename=filename):
+                with self.assertRaises(CommandError):
+                    self.call_import_books_command(filename)
+
+                self.assertEqual(self.books.count(), 0)
+
+    def test_invalid_authors_type(self):
+        books = [
+            {'name': 'Hamlet', 'edition': 1, 'publication_year': 1603, 'authors': 5},
+            {'name': '', 'edition': 1, 'publication_year': 1603, 'authors': {'name': 'William Shakespeare'}},
+        ]
+
+        with self.assertRaises(CommandError) as context:
+            self.call_import_books_command(self.write_ndjson_file(books))
+
+        error_messages = context.exception.args[0]
+
+        # The errors of all the books of the batch are reported together
+        self.assertIn('Line 1: The authors must be a list of names.', error_messages)
+        self.assertIn('Line 2: The authors must be a list of names.', error_messages)
+        self.assertIn('Line 2: This field cannot be blank.', error_messages)
+        self.assertEqual(self.books.count(), 0)
+
+    def test_create_missing_authors(self):
+        books = [{'name': 'Unknown', 'edition': 1, 'publication_year': 2000, 'authors': ['New Author']}]
+
+        self.call_import_books_command(self.write_ndjson_file(books), '--create-authors')
+
+        book = self.books.get()
+        self.assertListEqual([author.name for author in book.authors.all()], ['New Author'])
+
+    def test_invalid_header_column_name(self):
+        books = [{'name': 'Hamlet', 'edition': 1, 'publication_year': 1603, 'wrong': 'William Shakespeare'}]
+
+        filename = self.write_csv_file(books, header=['name', 'edition', 'publication_year', 'wrong'])
+
+        with self.assertRaises(CommandError):
+            self.call_import_books_command(filename)
+
+        self.assertEqual(self.books.count(), 0)
+
+    def test_invalid_json(self):
+        with self.create_file('.ndjson') as file:
+            file.write('{"name": "Hamlet"\n')
+
+        with self.assertRaises(CommandError):
+            self.call_import_books_command(file.name)
+
+    def test_nonexistent_file(self):
+        with self.assertRaises(CommandError):
+            self.call_import_books_command('nonexistent_file.csv')
+
+        self.assertEqual(self.books.count(), 0)
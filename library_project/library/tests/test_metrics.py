@@ -0,0 +1,83 @@
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+
+from library import metrics
+from library.models import Author
+from library.views import BookViewSet
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class MetricsTest(TestCase):
+    fixtures = ['test_data']
+
+    def setUp(self):
+        cache.clear()
+
+    def get_sample_value(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_metrics_by_view(self):
+        author = Author.objects.first()
+        requests = [
+            ('/api/books/', 'books-list', '200'),
+            (f'/api/authors/{author.id}/', 'authors-detail', '200'),
+            ('/nonexistent/', metrics.UNMATCHED_VIEW, '404'),
+        ]
+
+        for url, view, status in requests:
+            with self.subTest(url=url):
+                labels = {'view': view, 'method': 'GET', 'status': status}
+                metric_names = [
+                    'library_request_duration_seconds_count',
+                    'library_response_size_bytes_count',
+                    'library_request_db_queries_count',
+                ]
+                counts = {name: self.get_sample_value(name, **labels) for name in metric_names}
+                queries = self.get_sample_value('library_request_db_queries_sum', **labels)
+
+                response = self.client.get(url)
+
+                self.assertEqual(response.status_code, int(status))
+
+                for name in metric_names:
+                    self.assertEqual(self.get_sample_value(name, **labels), counts[name] + 1)
+
+                if view != metrics.UNMATCHED_VIEW:
+                    self.assertGreater(self.get_sample_value('library_request_db_queries_sum', **labels), queries)
+
+    def test_requests_in_progress(self):
+        labels = {'view': 'books-list', 'method': 'GET'}
+        original_list = BookViewSet.list
+        in_progress = []
+
+        def list_books(*args, **kwargs):
+            in_progress.append(self.get_sample_value('library_requests_in_progress', **labels))
+            return original_list(*args, **kwargs)
+
+        with mock.patch.object(BookViewSet, 'list', list_books):
+            self.client.get('/api/books/')
+
+        self.assertListEqual(in_progress, [1])
+        self.assertEqual(self.get_sample_value('library_requests_in_progress', **labels), 0)
+
+    def test_endpoint(self):
+        self.client.get('/api/books/')
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(
+            b'library_request_duration_seconds_count{method="GET",status="200",view="books-list"}', response.content
+        )
+
+    def test_multiprocess_registry(self):
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            with mock.patch.dict('os.environ', {metrics.MULTIPROCESS_DIR_ENV: metrics_dir}):
+                registry = metrics.get_registry()
+
+        self.assertIsNot(registry, REGISTRY)
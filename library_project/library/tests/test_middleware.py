@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from library.middleware import QUERY_COUNT_HEADER, QUERY_TIME_HEADER
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class QueryStatsMiddlewareTest(TestCase):
+    fixtures = ['test_data']
+
+    url = '/api/books/'
+
+    def setUp(self):
+        cache.clear()
+
+    def test_disabled(self):
+        with override_settings(SQL_INSTRUMENTATION=False):
+            response = self.client.get(self.url)
+
+        self.assertNotIn(QUERY_COUNT_HEADER, response)
+        self.assertNotIn(QUERY_TIME_HEADER, response)
+
+    @override_settings(SQL_INSTRUMENTATION=True)
+    def test_headers(self):
+        with CaptureQueriesContext(connection) as captured_queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(int(response[QUERY_COUNT_HEADER]), len(captured_queries))
+        self.assertGreater(int(response[QUERY_COUNT_HEADER]), 0)
+        self.assertGreaterEqual(float(response[QUERY_TIME_HEADER]), 0)
+
+    @override_settings(SQL_INSTRUMENTATION=True)
+    def test_log_fields(self):
+        with self.assertLogs('library.middleware', level='INFO') as logs:
+            response = self.client.get(self.url)
+
+        record = logs.records[0]
+
+        self.assertEqual(record.db_query_count, int(response[QUERY_COUNT_HEADER]))
+        self.assertAlmostEqual(record.db_time_ms, float(response[QUERY_TIME_HEADER]), delta=0.01)
+        self.assertIn(self.url, record.getMessage())
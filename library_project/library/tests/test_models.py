@@ -1,9 +1,13 @@
 import datetime
+import time
+import uuid
 
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.db import IntegrityError, transaction
+from django.test import TestCase, TransactionTestCase
 
-from library.models import Author, Book, strip_and_remove_duplicate_spaces
+from library.models import Author, Book, OnConflict, strip_and_remove_duplicate_spaces
+from library.utils import uuid7
 
 
 class AuthorModelTest(TestCase):
@@ -55,6 +59,68 @@ class AuthorModelTest(TestCase):
         with self.assertRaises(ValidationError):
             Author.objects.create(name=invalid_name)
 
+    def assertBookCount(self, author: Author, expected: int):
+        author.refresh_from_db()
+        self.assertEqual(author.book_count, expected)
+
+    def test_book_count_follows_books_changes(self):
+        author = Author.objects.create(name='George R. R. Martin')
+        book = Book.objects.create(name='A Game of Thrones', edition=1, publication_year=1996)
+        other_book = Book.objects.create(name='A Clash of Kings', edition=1, publication_year=1998)
+        self.assertBookCount(author, 0)
+
+        book.authors.add(author)
+        self.assertBookCount(author, 1)
+
+        author.books.add(other_book)
+        self.assertBookCount(author, 2)
+
+        book.authors.remove(author)
+        self.assertBookCount(author, 1)
+
+        book.authors.add(author)
+        book.authors.clear()
+        self.assertBookCount(author, 1)
+
+        author.books.clear()
+        self.assertBookCount(author, 0)
+
+        book.authors.add(author)
+        book.delete()
+        self.assertBookCount(author, 0)
+
+    def test_book_count_after_deleting_several_books(self):
+        author = Author.objects.create(name='George R. R. Martin')
+        other_author = Author.objects.create(name='Gardner Dozois')
+        books = Book.bulk_create(
+            [Book(name=name, edition=1, publication_year=2000) for name in ['Book 1', 'Book 2', 'Book 3']],
+            [[author], [author, other_author], [author]],
+        )
+        self.assertBookCount(author, 3)
+
+        Book.objects.filter(pk__in=[book.pk for book in books[:2]]).delete()
+        self.assertBookCount(author, 1)
+        self.assertBookCount(other_author, 0)
+
+        Book.objects.all().prefetch_related('authors').delete()
+        self.assertBookCount(author, 0)
+
+    def test_book_count_of_books_bulk_operations(self):
+        author = Author.objects.create(name='George R. R. Martin')
+        other_author = Author.objects.create(name='Gardner Dozois')
+        books = [
+            Book(name='Dangerous Women', edition=1, publication_year=2013),
+            Book(name='Rogues', edition=1, publication_year=2014),
+        ]
+
+        Book.bulk_create(books, [[author, other_author], [author]])
+        self.assertBookCount(author, 2)
+        self.assertBookCount(other_author, 1)
+
+        Book.bulk_update(books, [], [[author], [other_author]])
+        self.assertBookCount(author, 1)
+        self.assertBookCount(other_author, 1)
+
     def test_bulk_create_valid_authors(self):
         new_authors_names = ['William Shakespeare', 'William Faulkner', 'Henry James', 'Jane Austen']
         new_authors = Author.bulk_create(new_authors_names)
@@ -71,6 +137,30 @@ class AuthorModelTest(TestCase):
 
         self.assertEqual(self.authors.count(), self.authors_count_before)
 
+    def test_bulk_create_repeated_authors(self):
+        with self.assertRaises(ValidationError):
+            Author.bulk_create(['William Shakespeare', 'William  Shakespeare'])
+
+        self.assertEqual(self.authors.count(), self.authors_count_before)
+
+    def test_bulk_create_skipping_conflicts(self):
+        names = [self.existing_author.name, 'William Shakespeare', ' William Shakespeare']
+
+        new_authors = Author.bulk_create(names, on_conflict=OnConflict.SKIP)
+
+        self.assertListEqual([author.name for author in new_authors], ['William Shakespeare'])
+        self.assertEqual(self.authors.count(), self.authors_count_before + 1)
+
+    def test_bulk_create_updating_conflicts(self):
+        updated_at_before = self.existing_author.updated_at
+
+        new_authors = Author.bulk_create([self.existing_author.name], on_conflict=OnConflict.UPDATE)
+        self.existing_author.refresh_from_db()
+
+        self.assertListEqual(new_authors, [])
+        self.assertGreater(self.existing_author.updated_at, updated_at_before)
+        self.assertEqual(self.authors.count(), self.authors_count_before)
+
 
 class BookModelTest(TestCase):
     fixtures = ['test_data']
@@ -145,6 +235,132 @@ class BookModelTest(TestCase):
 
         self.assertEqual(self.books.count(), self.books_count_before)
 
+    def assertPrimaryAuthorSort(self, book: Book, expected: str):
+        book.refresh_from_db()
+        self.assertEqual(book.primary_author_sort, expected)
+
+    def test_primary_author_sort_follows_authors_changes(self):
+        book = Book.objects.create(name='Test Book', edition=1, publication_year=2020)
+        author_b = Author.objects.create(name='B Author')
+        author_c = Author.objects.create(name='C Author')
+        self.assertPrimaryAuthorSort(book, '')
+
+        book.authors.add(author_c)
+        self.assertPrimaryAuthorSort(book, 'C Author')
+
+        author_b.books.add(book)
+        self.assertPrimaryAuthorSort(book, 'B Author')
+
+        author_b.name = 'D Author'
+        author_b.save()
+        self.assertPrimaryAuthorSort(book, 'C Author')
+
+        book.authors.remove(author_c)
+        self.assertPrimaryAuthorSort(book, 'D Author')
+
+        book.authors.add(author_c)
+        author_c.books.clear()
+        self.assertPrimaryAuthorSort(book, 'D Author')
+
+        author_b.delete()
+        self.assertPrimaryAuthorSort(book, '')
+
+    def test_primary_author_sort_after_deleting_several_authors(self):
+        book = Book.objects.create(name='Test Book', edition=1, publication_year=2020)
+        other_book = Book.objects.create(name='Other Book', edition=1, publication_year=2020)
+        authors = [Author.objects.create(name=name) for name in ['Aaa X', 'Bbb X', 'Ccc X']]
+        book.authors.add(*authors)
+        other_book.authors.add(authors[1])
+
+        Author.objects.filter(name__in=['Aaa X', 'Bbb X']).delete()
+
+        self.assertPrimaryAuthorSort(book, 'Ccc X')
+        self.assertPrimaryAuthorSort(other_book, '')
+
+    def test_primary_author_sort_of_bulk_operations(self):
+        author_b = Author.objects.create(name='B Author')
+        author_c = Author.objects.create(name='C Author')
+
+        book, = Book.bulk_create([Book(name='Test Book', edition=1, publication_year=2020)], [[author_c, author_b]])
+        self.assertPrimaryAuthorSort(book, 'B Author')
+
+        Book.bulk_update([book], [], [[author_c]])
+        self.assertPrimaryAuthorSort(book, 'C Author')
+
+    def test_update_primary_author_sort(self):
+        Book.objects.update(primary_author_sort='')
+
+        updated_books = Book.update_primary_author_sort(Book.objects.all())
+
+        for book in self.books.prefetch_related('authors'):
+            with self.subTest(book=book):
+                self.assertEqual(book.primary_author_sort, min(author.name for author in book.authors.all()))
+
+        # Only the books whose sort key changed are updated
+        self.assertEqual(updated_books, self.books.count())
+        self.assertEqual(Book.update_primary_author_sort(Book.objects.all()), 0)
+
+
+class ModelConstraintsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name='Constrained Author')
+        cls.book = Book.objects.create(name='Constrained Book', edition=1, publication_year=2000)
+
+    def test_constraints_reject_invalid_rows(self):
+        writes = [
+            lambda: Author.objects.bulk_create([Author(name='')]),
+            lambda: Book.objects.bulk_create([Book(name='', edition=1, publication_year=2000)]),
+            lambda: Book.objects.filter(pk=self.book.pk).update(edition=0),
+            lambda: Book.objects.filter(pk=self.book.pk).update(publication_year=0),
+        ]
+
+        for index, write in enumerate(writes):
+            with self.subTest(write=index), self.assertRaises(IntegrityError), transaction.atomic():
+                write()
+
+    def test_save_without_validation(self):
+        book = Book(name='  Fast   Book ', edition=2, publication_year=2001)
+
+        with self.assertNumQueries(3):
+            # The INSERT inside a savepoint, without the SELECT of the unique check of the id
+            book.save(validate=False)
+
+        book.refresh_from_db()
+        self.assertEqual(book.name, 'Fast Book')
+
+    def test_save_without_validation_reports_invalid_fields(self):
+        existing_name_errors = {'name': ['Author with the name "Constrained Author" already exists.']}
+        invalid_models = [
+            (Author(name=' '), {'name': ['This field cannot be blank.']}),
+            (Author(name='Constrained Author'), existing_name_errors),
+            (Book(name='Book', edition=0, publication_year=2000), {'edition': min_value_errors(1)}),
+        ]
+
+        for model, errors in invalid_models:
+            with self.subTest(model=model), self.assertRaises(ValidationError) as context:
+                model.save(validate=False)
+
+            self.assertDictEqual(context.exception.message_dict, errors)
+
+        # The savepoint kept the transaction usable
+        self.assertEqual(Author.objects.filter(name='Constrained Author').count(), 1)
+
+
+class SaveWithoutValidationQueriesTest(TransactionTestCase):
+
+    def test_saves_the_unique_checks(self):
+        with self.assertNumQueries(3):
+            Author(name='Validated Author').save()
+
+        with self.assertNumQueries(1):
+            Author(name='Unvalidated Author').save(validate=False)
+
+
+def min_value_errors(limit_value):
+    return [f'Ensure this value is greater than or equal to {limit_value}.']
+
 
 class ModelUtilsTest(TestCase):
     def test_strip_and_remove_duplicate_spaces(self):
@@ -152,3 +368,35 @@ class ModelUtilsTest(TestCase):
         self.assertEqual('', strip_and_remove_duplicate_spaces(' \t  \n'))
         self.assertEqual('Test String', strip_and_remove_duplicate_spaces('Test String'))
         self.assertEqual('Test String', strip_and_remove_duplicate_spaces(' \tTest \t  \n String \t'))
+
+
+class GenerateIdTest(TestCase):
+
+    def test_random_ids(self):
+        with self.settings(TIME_ORDERED_IDS=False):
+            author = Author.objects.create(name='Random Id Author')
+
+        self.assertEqual(author.id.version, 4)
+
+    def test_time_ordered_ids(self):
+        with self.settings(TIME_ORDERED_IDS=True):
+            authors = [Author.objects.create(name=f'Time Ordered Id Author {index}') for index in range(3)]
+            time.sleep(0.002)
+            later_author = Author.objects.create(name='Later Author')
+
+        for author in [*authors, later_author]:
+            self.assertEqual(author.id.version, 7)
+            self.assertEqual(author.id.variant, uuid.RFC_4122)
+
+        self.assertGreater(later_author.id, max(author.id for author in authors))
+        self.assertEqual(Author.objects.order_by('id').last(), later_author)
+
+    def test_uuid7_timestamp(self):
+        timestamp_ms = 1700000000123
+
+        first_id = uuid7(timestamp_ms)
+        second_id = uuid7(timestamp_ms + 1)
+
+        self.assertEqual(first_id.int >> 80, timestamp_ms)
+        self.assertLess(first_id, second_id)
+        self.assertNotEqual(uuid7(timestamp_ms), first_id)
@@ -0,0 +1,37 @@
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from library.models import Author
+
+
+class ReconcileBookCountsTest(TestCase):
+    fixtures = ['test_data']
+
+    def call_reconcile_command(self, *options):
+        stdout = StringIO()
+        call_command('reconcile_book_counts', *options, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_reconcile(self):
+        Author.objects.update(book_count=0)
+        authors_with_books = Author.objects.filter(books__isnull=False).distinct().count()
+
+        output = self.call_reconcile_command('--batch-size', '2')
+
+        self.assertIn(f'{authors_with_books} authors fixed.', output)
+
+        for author in Author.objects.all():
+            with self.subTest(author=author):
+                self.assertEqual(author.book_count, author.books.count())
+
+    def test_reconcile_in_sync_counts(self):
+        output = self.call_reconcile_command()
+
+        self.assertIn('0 authors fixed.', output)
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(CommandError):
+            self.call_reconcile_command('--batch-size', '0')
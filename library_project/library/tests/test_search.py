@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from library.models import Author, Book
+from library.search import filter_books_by_author_name_contains, filter_name_contains, preserve_sqlite_search_indexes
+
+
+class FilterNameContainsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = Author.objects.all()
+        Author.bulk_create(['William Shakespeare', 'William Faulkner', 'Jane Austen', '100% Anonymous', 'Under_Score'])
+
+    def search_names(self, value):
+        return [author.name for author in filter_name_contains(self.authors, value)]
+
+    def test_substring_ignoring_case(self):
+        self.assertCountEqual(self.search_names('william'), ['William Shakespeare', 'William Faulkner'])
+        self.assertCountEqual(self.search_names('AUST'), ['Jane Austen'])
+        self.assertCountEqual(self.search_names('w'), ['William Shakespeare', 'William Faulkner'])
+        self.assertListEqual(self.search_names('Nonexistent'), [])
+
+    def test_like_wildcards_are_literal(self):
+        self.assertListEqual(self.search_names('0%'), ['100% Anonymous'])
+        self.assertListEqual(self.search_names('r_s'), ['Under_Score'])
+        self.assertListEqual(self.search_names('%'), ['100% Anonymous'])
+        self.assertListEqual(self.search_names('_'), ['Under_Score'])
+
+    def test_index_follows_updates_and_deletes(self):
+        author = self.authors.get(name='Jane Austen')
+        author.name = 'Leo Tolstoy'
+        author.save()
+
+        self.assertListEqual(self.search_names('Austen'), [])
+        self.assertListEqual(self.search_names('tolstoy'), ['Leo Tolstoy'])
+
+        author.delete()
+
+        self.assertListEqual(self.search_names('tolstoy'), [])
+
+
+class FilterBooksByAuthorNameContainsTest(TestCase):
+    def test_book_with_several_matching_authors_is_not_duplicated(self):
+        authors = Author.bulk_create(['Neil Gaiman', 'Neil Stephenson'])
+        book = Book.objects.create(name='Imaginary Book', edition=1, publication_year=2000)
+        book.authors.set(authors)
+
+        books = filter_books_by_author_name_contains(Book.objects.all(), 'neil')
+
+        self.assertListEqual(list(books), [book])
+
+
+class PreserveSqliteSearchIndexesTest(SimpleTestCase):
+    def test_only_sqlite_rebuilds_the_search_indexes(self):
+        drop_operation, create_operation = preserve_sqlite_search_indexes()
+
+        for vendor, executed in [('sqlite', True), ('postgresql', False)]:
+            schema_editor = mock.Mock()
+            schema_editor.connection.vendor = vendor
+
+            with self.subTest(vendor=vendor):
+                drop_operation.code(None, schema_editor)
+                create_operation.code(None, schema_editor)
+
+                self.assertEqual(schema_editor.execute.called, executed)
@@ -0,0 +1,78 @@
+import uuid
+
+from django.test import TestCase
+
+from library.models import Author, Book
+from library.serializers import BookReadSerializer, BookSerializer
+
+
+class BookReadSerializerTest(TestCase):
+    fixtures = ['test_data']
+
+    def setUp(self):
+        self.books = Book.objects.order_by('name', 'id')
+
+    def serialize_with_model_serializer(self):
+        return BookSerializer(self.books.prefetch_related('authors'), many=True).data
+
+    def serialize_with_read_serializer(self):
+        return BookReadSerializer(self.books.values(*BookReadSerializer.values_fields), many=True).data
+
+    def assertSameBooks(self, books, expected_books):
+        self.assertEqual(len(books), len(expected_books))
+
+        for book, expected_book in zip(books, expected_books):
+            with self.subTest(book=expected_book['name']):
+                self.assertListEqual(list(book), list(expected_book))
+                self.assertDictEqual({**book, 'authors': None}, {**expected_book, 'authors': None})
+                self.assertCountEqual(book['authors'], expected_book['authors'])
+
+    def test_same_representation_as_model_serializer(self):
+        self.assertSameBooks(self.serialize_with_read_serializer(), self.serialize_with_model_serializer())
+
+    def test_single_book(self):
+        book = self.books.values(*BookReadSerializer.values_fields).first()
+        expected_book = BookSerializer(self.books.first()).data
+
+        self.assertSameBooks([BookReadSerializer(book).data], [expected_book])
+
+    def test_authors_fetched_in_a_single_query(self):
+        books = list(self.books.values(*BookReadSerializer.values_fields))
+
+        with self.assertNumQueries(1):
+            BookReadSerializer(books, many=True).data
+
+
+class BookSerializerTest(TestCase):
+    fixtures = ['test_data']
+
+    def book_data(self, authors_ids):
+        return {'name': 'New Book', 'edition': 1, 'publication_year': 2020, 'authors': [str(id) for id in authors_ids]}
+
+    def test_authors_fetched_in_a_single_query(self):
+        authors_ids = list(Author.objects.values_list('id', flat=True))
+        serializer = BookSerializer(data=self.book_data(authors_ids))
+
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+
+        self.assertCountEqual([author.id for author in serializer.validated_data['authors']], authors_ids)
+
+    def test_all_missing_authors_reported(self):
+        author = Author.objects.first()
+        missing_ids = [uuid.uuid4(), 'invalid']
+        serializer = BookSerializer(data=self.book_data([author.id, *missing_ids]))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(len(serializer.errors['authors']), 1)
+
+        for missing_id in missing_ids:
+            self.assertIn(str(missing_id), serializer.errors['authors'][0])
+
+    def test_authors_shared_across_batch(self):
+        authors_ids = list(Author.objects.values_list('id', flat=True)[:2])
+        books_data = [self.book_data(authors_ids), self.book_data(authors_ids[:1])]
+        serializer = BookSerializer(data=books_data, many=True)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
@@ -0,0 +1,78 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from library import server_benchmarks
+
+
+class OkHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        status = 200 if self.path == '/ok/' else 500
+
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+class ServerBenchmarksTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(('127.0.0.1', 0), OkHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def get_url(self, path):
+        return f'http://127.0.0.1:{self.server.server_port}{path}'
+
+    def test_load_test(self):
+        result = server_benchmarks.load_test(self.get_url('/ok/'), concurrency=4, requests=20)
+
+        self.assertEqual(result['errors'], 0)
+        self.assertGreater(result['requests_per_second'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+        self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+
+    def test_load_test_errors(self):
+        result = server_benchmarks.load_test(self.get_url('/error/'), concurrency=2, requests=5)
+
+        self.assertEqual(result['errors'], 5)
+        self.assertEqual(result['requests_per_second'], 0)
+        self.assertEqual(result['p50_ms'], 0)
+
+    def test_get_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(server_benchmarks.get_percentile(values, 50), 50)
+        self.assertEqual(server_benchmarks.get_percentile(values, 99), 99)
+        self.assertEqual(server_benchmarks.get_percentile([7], 99), 7)
+        self.assertEqual(server_benchmarks.get_percentile([], 50), 0)
+
+
+class BenchmarkServersCommandTest(TestCase):
+
+    def test_invalid_servers(self):
+        with self.assertRaisesMessage(CommandError, 'The --servers option'):
+            call_command('benchmark_servers', servers='wsgi,fastcgi', stdout=StringIO())
+
+    def test_invalid_concurrency(self):
+        with self.assertRaisesMessage(CommandError, '--concurrency must be a positive integer.'):
+            call_command('benchmark_servers', concurrency=0, stdout=StringIO())
+
+    def test_empty_catalog(self):
+        with self.assertRaisesMessage(CommandError, 'generate_catalog'):
+            call_command('benchmark_servers', stdout=StringIO())
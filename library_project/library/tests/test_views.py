@@ -1,23 +1,39 @@
+import csv
+import io
+import json
 import uuid
+from contextlib import contextmanager
 from typing import List
+from unittest import mock
 
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from library import cache as response_cache
 from library.models import Author, Book
+from library.pagination import EstimatedCountPaginator, KeysetPagination
+from library.views import BookViewSet
 
 
 class BaseRestApiTest(APITestCase):
     base_url = None
 
-    def list(self, query=None):
+    def setUp(self):
+        # The cached responses are not rolled back with the database between tests
+        cache.clear()
+
+    def list(self, query=None, **headers):
         if query is None:
             query = {}
 
-        return self.client.get(self.base_url, query, format='json')
+        return self.client.get(self.base_url, query, format='json', **headers)
 
-    def retrieve(self, resource_id):
-        return self.client.get(self.base_url + f'{resource_id}/', format='json')
+    def retrieve(self, resource_id, query=None):
+        return self.client.get(self.base_url + f'{resource_id}/', query, format='json')
 
     def create(self, payload):
         return self.client.post(self.base_url, payload, format='json')
@@ -31,6 +47,29 @@ class BaseRestApiTest(APITestCase):
     def delete(self, resource_id):
         return self.client.delete(self.base_url + f'{resource_id}/', format='json')
 
+    def bulk_partial_update(self, payload):
+        return self.client.patch(self.base_url, payload, format='json')
+
+    def bulk_delete(self, payload):
+        return self.client.delete(self.base_url, payload, format='json')
+
+    def export(self, query=None):
+        """
+        Return the response of the export and its content, parsed as NDJSON or CSV (as dicts), depending on the
+        'format' query parameter.
+        """
+        response = self.client.get(self.base_url + 'export/', query)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        content = b''.join(response.streaming_content).decode('utf-8')
+
+        if (query or {}).get('format') == 'csv':
+            return response, list(csv.DictReader(io.StringIO(content)))
+
+        return response, [json.loads(line) for line in content.splitlines()]
+
     def assertPaginatedListQueryParams(self, page_query_param, page_size_query_param):
         """
         Asserts that the list endpoint is paginated and accepts 'page_query_param' as query parameter to control
@@ -47,6 +86,155 @@ class BaseRestApiTest(APITestCase):
         self.assertIsNotNone(data['next'])
         self.assertIsNotNone(data['previous'])
 
+    def assertListCountModes(self, queryset):
+        """
+        Asserts that the count of the list endpoint is exact by default, that the estimated count is exact for small
+        results and capped for larger ones, flagged by 'count_is_exact', and that the count can be omitted with the
+        'count' query parameter.
+        """
+        response = self.list({'page': 'last', 'page_size': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(response.data.keys(), ['count', 'next', 'previous', 'results'])
+        self.assertEqual(response.data['count'], queryset.count())
+
+        response = self.list({'count': 'estimated'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], queryset.count())
+        self.assertIs(response.data['count_is_exact'], True)
+
+        with mock.patch.object(EstimatedCountPaginator, 'count_cap', 2):
+            response = self.list({'count': 'estimated', 'page': 3, 'page_size': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertIs(response.data['count_is_exact'], False)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assert404NotFound(self.list({'count': 'estimated', 'page': 'last'}))
+
+        response = self.list({'count': 'none', 'page': 2, 'page_size': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(response.data.keys(), ['results', 'next', 'previous'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNotNone(response.data['previous'])
+
+        last_page = self.list({'count': 'none', 'page': queryset.count(), 'page_size': 1})
+
+        self.assertEqual(last_page.status_code, status.HTTP_200_OK)
+        self.assertIsNone(last_page.data['next'])
+        self.assert404NotFound(self.list({'count': 'none', 'page': queryset.count() + 1, 'page_size': 1}))
+
+    def list_all_pages_with_cursor(self, query=None) -> List[dict]:
+        """
+        Follows the 'next' links of the keyset paginated list, starting with an empty cursor, and returns the results
+        of all pages.
+        """
+        query = {'cursor': '', 'page_size': 1, **(query or {})}
+        response = self.list(query)
+        results = []
+
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertCountEqual(response.data.keys(), ['next', 'results'])
+            self.assertLessEqual(len(response.data['results']), 1)
+
+            results.extend(response.data['results'])
+
+            if response.data['next'] is None:
+                return results
+
+            response = self.client.get(response.data['next'], format='json')
+
+    def assertKeysetPaginationFollowsOrdering(self, queryset, orderings):
+        """
+        Asserts that paging through the list endpoint with cursors returns all the items once, in the same order as
+        the queryset ordered by each one of the 'orderings' (with the id as tiebreaker).
+        """
+        for ordering in orderings:
+            with self.subTest(ordering=ordering):
+                results = self.list_all_pages_with_cursor({'ordering': ordering})
+
+                expected_ids = [str(pk) for pk in queryset.order_by(ordering, 'id').values_list('id', flat=True)]
+
+                self.assertListEqual([result['id'] for result in results], expected_ids)
+
+    def assertResponseIsCached(self, query=None):
+        """
+        Asserts that the second list request with the same (reordered) query parameters is served from the cache.
+        """
+        query = query or {}
+
+        first_response = self.list(query)
+        second_response = self.list(dict(reversed(list(query.items()))))
+
+        self.assertEqual(first_response['X-Cache'], 'MISS')
+        self.assertEqual(second_response['X-Cache'], 'HIT')
+        self.assertEqual(first_response.data, second_response.data)
+
+    def assertConditionalGet(self, url, query=None):
+        """
+        Asserts that the response to the URL has ETag and Last-Modified headers and that the requests with them as
+        If-None-Match or If-Modified-Since are answered with 304 Not Modified: with the validators query alone without
+        the response cache, and without any query from the cache.
+        """
+        response = self.client.get(url, query, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        conditional_headers = [
+            {'HTTP_IF_NONE_MATCH': response['ETag']},
+            {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+        ]
+
+        for cache_timeout, queries in [(0, 1), (60, 1), (60, 0)]:
+            for headers in conditional_headers:
+                with self.subTest(cache_timeout=cache_timeout, queries=queries, headers=headers):
+                    with self.settings(API_CACHE_TIMEOUT=cache_timeout), self.assertNumQueries(queries):
+                        not_modified_response = self.client.get(url, query, format='json', **headers)
+
+                    self.assertEqual(not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED)
+                    self.assertEqual(not_modified_response['ETag'], response['ETag'])
+                    self.assertEqual(not_modified_response.content, b'')
+
+            if cache_timeout:
+                # Cache the response for the next requests
+                with self.settings(API_CACHE_TIMEOUT=cache_timeout):
+                    self.client.get(url, query, format='json')
+
+        return response
+
+    @contextmanager
+    def assertMaxQueries(self, max_queries):
+        """
+        Asserts that the code inside the context runs at most 'max_queries' SQL queries, listing them otherwise.
+        """
+        with CaptureQueriesContext(connection) as captured_queries:
+            yield
+
+        queries = [query['sql'] for query in captured_queries]
+
+        self.assertLessEqual(
+            len(queries), max_queries,
+            f'{len(queries)} queries executed, {max_queries} expected at most:\n' + '\n'.join(queries)
+        )
+
+    def assertQueryBudget(self, budgets):
+        """
+        Asserts that the (url, query, max_queries) requests of 'budgets' succeed running at most 'max_queries' SQL
+        queries each, without the cached responses.
+        """
+        for url, query, max_queries in budgets:
+            with self.subTest(url=url, query=query), self.settings(API_CACHE_TIMEOUT=0):
+                with self.assertMaxQueries(max_queries):
+                    response = self.client.get(url, query, format='json')
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def assert404NotFound(self, response):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertCountEqual(response.data.keys(), ['detail'])
@@ -80,7 +268,8 @@ class AuthorsApiTest(BaseRestApiTest):
     def author_to_json(self, author: Author):
         return {
             'id': str(author.id),
-            'name': author.name
+            'name': author.name,
+            'book_count': author.book_count
         }
 
     def test_list(self):
@@ -93,6 +282,151 @@ class AuthorsApiTest(BaseRestApiTest):
     def test_list_page_query_params(self):
         self.assertPaginatedListQueryParams('page', 'page_size')
 
+    def test_list_count_modes(self):
+        self.assertListCountModes(self.authors)
+
+    def test_list_keyset_pagination(self):
+        self.assertKeysetPaginationFollowsOrdering(self.authors, ['name', '-name', 'book_count', '-book_count'])
+
+    def test_list_book_count(self):
+        response = self.list({'ordering': '-book_count', 'page_size': 100})
+
+        results = response.data['results']
+        books_counts = {str(author.id): author.books.count() for author in self.authors}
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(max(result['book_count'] for result in results), 0)
+        self.assertListEqual(
+            [result['book_count'] for result in results], sorted(books_counts.values(), reverse=True)
+        )
+
+        for result in results:
+            self.assertEqual(result['book_count'], books_counts[result['id']])
+
+    def test_list_keyset_pagination_invalid_cursor(self):
+        positions = [['x', 'not-a-uuid'], ['x', None], [None, str(uuid.uuid4())], ['x', {'id': 1}], ['x']]
+        cursors = ['invalid'] + [KeysetPagination.encode_position(position) for position in positions]
+
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.list({'cursor': cursor})
+
+                self.assert404NotFound(response)
+
+    def test_list_keyset_pagination_invalid_cursor_value_types(self):
+        response = self.list({'cursor': KeysetPagination.encode_position(['x', 0]), 'ordering': 'book_count'})
+
+        self.assert404NotFound(response)
+
+    @override_settings(API_CACHE_TIMEOUT=60)
+    def test_list_cached_until_authors_change(self):
+        self.assertResponseIsCached({'name': 'a', 'page_size': 100})
+
+        Author.objects.create(name='New Author')
+
+        response = self.list({'name': 'a', 'page_size': 100})
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('New Author', [author['name'] for author in response.data['results']])
+
+    def test_list_conditional_get(self):
+        response = self.assertConditionalGet(self.base_url, {'name': 'a'})
+
+        Author.objects.create(name='New Author')
+
+        modified_response = self.list({'name': 'a'}, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(modified_response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified_response['ETag'], response['ETag'])
+
+    def test_list_conditional_get_after_older_author_deleted(self):
+        author = self.authors.order_by('updated_at').first()
+        author_id = str(author.id)
+        response = self.assertConditionalGet(self.base_url, {'page_size': 100})
+
+        author.delete()
+
+        modified_response = self.list({'page_size': 100}, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(modified_response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(author_id, [result['id'] for result in modified_response.data['results']])
+
+    def test_retrieve_conditional_get(self):
+        author = self.authors.first()
+
+        self.assertConditionalGet(self.base_url + f'{author.id}/')
+
+    def test_query_budget(self):
+        author = self.authors.first()
+
+        self.assertQueryBudget([
+            (self.base_url, {'page_size': 100}, 3),
+            (self.base_url, {'cursor': ''}, 2),
+            (self.base_url + f'{author.id}/', None, 2),
+        ])
+
+    def test_sparse_fields(self):
+        author = self.authors.first()
+
+        response = self.list({'fields': 'name,id', 'page_size': 100})
+        retrieve_response = self.retrieve(author.id, {'fields': 'book_count'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(
+            response.data['results'], [{'id': str(author.id), 'name': author.name} for author in self.authors]
+        )
+        self.assertDictEqual(retrieve_response.data, {'book_count': author.book_count})
+
+    def test_sparse_fields_keyset_pagination(self):
+        results = self.list_all_pages_with_cursor({'fields': 'id', 'ordering': '-book_count'})
+
+        expected_ids = self.authors.order_by('-book_count', 'id').values_list('id', flat=True)
+
+        self.assertListEqual(results, [{'id': str(author_id)} for author_id in expected_ids])
+
+    def test_sparse_fields_only_fetch_the_requested_columns(self):
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.list({'fields': 'id', 'ordering': 'name'})
+
+        page_query = next(query['sql'] for query in captured_queries if 'LIMIT' in query['sql'])
+
+        self.assertIn('"library_author"."name"', page_query)
+        self.assertNotIn('"library_author"."book_count"', page_query)
+
+    def test_sparse_fields_unknown(self):
+        response = self.list({'fields': 'id,books'})
+
+        self.assert400BadRequestWithErrors(response, ['fields'])
+
+    def test_export(self):
+        response, results = self.export()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertListEqual(results, [self.author_to_json(author) for author in self.authors.order_by('name')])
+
+    def test_export_csv(self):
+        response, results = self.export({'format': 'csv', 'ordering': '-book_count'})
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertCountEqual(
+            results,
+            [
+                {'id': str(author.id), 'name': author.name, 'book_count': str(author.book_count)}
+                for author in self.authors
+            ]
+        )
+        book_counts = self.authors.order_by('-book_count').values_list('book_count', flat=True)
+
+        self.assertListEqual([result['book_count'] for result in results], [str(count) for count in book_counts])
+
+    def test_export_filtered(self):
+        author = self.authors.first()
+
+        _, results = self.export({'name': author.name})
+
+        self.assertIn(self.author_to_json(author), results)
+        self.assertEqual(len(results), self.authors.filter(name__icontains=author.name).count())
+
     def test_retrieve(self):
         author = self.authors.first()
 
@@ -190,6 +524,236 @@ class BooksApiTest(BaseRestApiTest):
     def test_list_page_query_params(self):
         self.assertPaginatedListQueryParams('page', 'page_size')
 
+    def test_list_count_modes(self):
+        self.assertListCountModes(self.books)
+
+    def test_list_keyset_pagination(self):
+        orderings = ['name', '-name', 'edition', '-publication_year']
+
+        self.assertKeysetPaginationFollowsOrdering(self.books, orderings)
+
+    def test_list_keyset_pagination_with_filter(self):
+        results = self.list_all_pages_with_cursor({'edition': 1})
+
+        self.assertEqual(len(results), self.books.filter(edition=1).count())
+
+    def test_list_ordering_by_author_name(self):
+        for ordering in ['authors__name', '-authors__name']:
+            with self.subTest(ordering=ordering):
+                response = self.list({'ordering': ordering, 'page_size': 100})
+
+                results_ids = [result['id'] for result in response.data['results']]
+                first_authors_names = [
+                    min(author['name'] for author in result['authors']) for result in response.data['results']
+                ]
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(results_ids), self.books.count())
+                self.assertCountEqual(results_ids, set(results_ids))
+                self.assertListEqual(
+                    first_authors_names, sorted(first_authors_names, reverse=ordering.startswith('-'))
+                )
+
+    def test_list_keyset_pagination_ordering_by_author_name(self):
+        results = self.list_all_pages_with_cursor({'ordering': 'authors__name'})
+
+        expected_ids = self.books.order_by('primary_author_sort', 'id').values_list('id', flat=True)
+
+        self.assertListEqual([result['id'] for result in results], [str(book_id) for book_id in expected_ids])
+
+    @override_settings(API_CACHE_TIMEOUT=60)
+    def test_list_cached_until_books_change(self):
+        self.assertResponseIsCached({'ordering': '-name', 'page_size': 100})
+
+        book = self.books.first()
+        response = self.partial_update(book.id, {'name': 'Updated Book'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.list({'ordering': '-name', 'page_size': 100})
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('Updated Book', [result['name'] for result in response.data['results']])
+
+    @override_settings(API_CACHE_TIMEOUT=60)
+    def test_retrieve_cached_until_authors_change(self):
+        book = self.books.first()
+        author = book.authors.first()
+
+        self.assertEqual(self.retrieve(book.id)['X-Cache'], 'MISS')
+        self.assertEqual(self.retrieve(book.id)['X-Cache'], 'HIT')
+
+        author.name = 'Renamed Author'
+        author.save()
+
+        response = self.retrieve(book.id)
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('Renamed Author', [result['name'] for result in response.data['authors']])
+
+    def test_list_conditional_get(self):
+        self.assertConditionalGet(self.base_url, {'edition': 1})
+
+    def test_retrieve_conditional_get_after_authors_change(self):
+        book = self.books.first()
+        url = self.base_url + f'{book.id}/'
+
+        response = self.assertConditionalGet(url)
+
+        new_author = Author.objects.create(name='New Author')
+        book.authors.add(new_author)
+
+        modified_response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(modified_response.status_code, status.HTTP_200_OK)
+        self.assertIn('New Author', [author['name'] for author in modified_response.data['authors']])
+
+    def test_list_conditional_get_after_author_renamed(self):
+        book = self.books.first()
+        response = self.assertConditionalGet(self.base_url, {'page_size': 100})
+
+        author = book.authors.first()
+        author.name = 'Renamed Author'
+        author.save()
+
+        modified_response = self.list({'page_size': 100}, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(modified_response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified_response['ETag'], response['ETag'])
+
+    def test_query_budget(self):
+        book = self.books.first()
+
+        # The authors of all the books in the page are fetched at once, so the budget does not grow with the page size
+        self.assertQueryBudget([
+            (self.base_url, {'page_size': 100}, 4),
+            (self.base_url, {'ordering': 'authors__name', 'page_size': 100}, 4),
+            (self.base_url, {'cursor': ''}, 3),
+            (self.base_url + f'{book.id}/', None, 3),
+        ])
+
+    @override_settings(API_CACHE_TIMEOUT=60)
+    def test_cached_responses_run_no_queries(self):
+        book = self.books.first()
+
+        requests = [(self.base_url, {'count': 'none'}), (self.base_url, None), (self.base_url + f'{book.id}/', None)]
+
+        for url, query in requests:
+            with self.subTest(url=url, query=query):
+                self.client.get(url, query, format='json')
+
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, query, format='json')
+
+                self.assertEqual(response['X-Cache'], 'HIT')
+                self.assertIn('ETag', response)
+
+    def test_sparse_fields(self):
+        book = self.books.first()
+
+        response = self.list({'fields': 'id,name', 'page_size': 100})
+        retrieve_response = self.retrieve(book.id, {'fields': 'publication_year,authors'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(
+            response.data['results'], [{'id': str(book.id), 'name': book.name} for book in self.books]
+        )
+        self.assertDictEqual(
+            retrieve_response.data,
+            {'publication_year': book.publication_year, 'authors': self.authors_to_json(book.authors.all())}
+        )
+
+    def test_sparse_fields_keyset_pagination(self):
+        for ordering in ['edition', 'authors__name']:
+            with self.subTest(ordering=ordering):
+                results = self.list_all_pages_with_cursor({'fields': 'name', 'ordering': ordering})
+
+                self.assertEqual(len(results), self.books.count())
+                self.assertTrue(all(list(result) == ['name'] for result in results))
+
+    def test_sparse_fields_unknown(self):
+        response = self.list({'fields': 'name,isbn'})
+
+        self.assert400BadRequestWithErrors(response, ['fields'])
+
+    def test_authors_ids(self):
+        book = self.books.first()
+
+        response = self.retrieve(book.id, {'authors': 'ids'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertDictEqual(
+            response.data, {**self.book_to_json(book), 'authors': [str(author.id) for author in book.authors.all()]}
+        )
+
+    def test_authors_invalid(self):
+        response = self.list({'authors': 'names'})
+
+        self.assert400BadRequestWithErrors(response, ['authors'])
+
+    def test_sparse_fields_query_budget(self):
+        book = self.books.first()
+
+        # Without the authors field their query is skipped
+        self.assertQueryBudget([
+            (self.base_url, {'fields': 'id,name', 'page_size': 100}, 3),
+            (self.base_url, {'fields': 'id,name', 'cursor': ''}, 2),
+            (self.base_url + f'{book.id}/', {'fields': 'name'}, 2),
+            (self.base_url, {'authors': 'ids', 'page_size': 100}, 4),
+        ])
+
+    def test_authors_ids_do_not_join_authors(self):
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.list({'authors': 'ids'})
+
+        authors_queries = [query['sql'] for query in captured_queries if 'FROM "library_book_authors"' in query['sql']]
+
+        self.assertEqual(len(authors_queries), 1)
+        self.assertNotIn('"library_author"', authors_queries[0])
+
+    def test_export(self):
+        response, results = self.export()
+
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="books.ndjson"')
+        self.assertCountEqual(results, [self.book_to_json(book) for book in self.books])
+
+    def test_export_csv(self):
+        response, results = self.export({'format': 'csv'})
+
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="books.csv"')
+        self.assertCountEqual(
+            results,
+            [
+                {
+                    'id': str(book.id),
+                    'name': book.name,
+                    'edition': str(book.edition),
+                    'publication_year': str(book.publication_year),
+                    'authors': ';'.join(author.name for author in book.authors.all()),
+                }
+                for book in self.books
+            ]
+        )
+
+    def test_export_filtered(self):
+        book = self.books.first()
+
+        _, results = self.export({'publication_year': book.publication_year})
+
+        self.assertCountEqual(
+            results, [self.book_to_json(book) for book in self.books.filter(publication_year=book.publication_year)]
+        )
+
+    def test_export_fetches_authors_in_chunks(self):
+        with mock.patch.object(BookViewSet, 'export_chunk_size', 2), self.assertMaxQueries(4):
+            _, results = self.export()
+
+        self.assertEqual(len(results), self.books.count())
+
+    def test_export_invalid_filter(self):
+        response = self.client.get(self.base_url + 'export/', {'publication_year': 'invalid'})
+
+        self.assert400BadRequestWithErrors(response, ['publication_year'])
+
     def test_retrieve(self):
         book = self.books.first()
 
@@ -299,6 +863,33 @@ class BooksApiTest(BaseRestApiTest):
 
         self.assertSearchHasNoResults(response)
 
+    def test_search_author_id(self):
+        authors = list(self.authors[:2])
+        queries = [[authors[0]], authors]
+
+        for query_authors in queries:
+            with self.subTest(authors=query_authors):
+                query = {'author_id': ','.join(str(author.id) for author in query_authors), 'page_size': 100}
+                response = self.list(query)
+
+                results_ids = [result['id'] for result in response.data['results']]
+                db_filter_ids = self.books.filter(authors__in=query_authors).values_list('id', flat=True).distinct()
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertGreaterEqual(len(results_ids), 1)
+                self.assertEqual(response.data['count'], len(results_ids))
+                self.assertCountEqual(results_ids, [str(book_id) for book_id in db_filter_ids])
+
+    def test_search_nonexistent_author_id(self):
+        response = self.list({'author_id': str(uuid.uuid4())})
+
+        self.assertSearchHasNoResults(response)
+
+    def test_search_invalid_author_id(self):
+        response = self.list({'author_id': 'invalid'})
+
+        self.assert400BadRequestWithErrors(response, ['author_id'])
+
     def test_search_by_multiple_fields(self):
         book = self.books.first()
 
@@ -496,3 +1087,137 @@ class BooksApiTest(BaseRestApiTest):
 
         self.assert404NotFound(response)
         self.assertEqual(self.books.count(), books_count_before)
+
+    def test_bulk_create(self):
+        authors = list(self.authors[:2])
+        new_books = [
+            {'name': f'New Book {index}', 'edition': 1, 'publication_year': 2020, 'authors': [str(author.id)]}
+            for index, author in enumerate(authors)
+        ]
+        new_books[0]['authors'].append(str(authors[1].id))
+
+        books_count_before = self.books.count()
+
+        # Authors of the whole batch, savepoint, books insert, through table insert, book counts update, savepoint
+        # release, response authors
+        with self.assertNumQueries(7):
+            response = self.create(new_books)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.books.count(), books_count_before + len(new_books))
+        self.assertEqual(len(response.data), len(new_books))
+
+        for data, new_book in zip(response.data, new_books):
+            saved_book = self.books.get(pk=data['id'])
+
+            self.assertDictEqual(data, self.book_to_json(saved_book))
+            self.assertEqual(data['name'], new_book['name'])
+            self.assertCountEqual([author['id'] for author in data['authors']], new_book['authors'])
+
+    def test_bulk_create_invalid(self):
+        author = self.authors.first()
+        new_books = [
+            {'name': 'New Book', 'edition': 1, 'publication_year': 2020, 'authors': [str(author.id)]},
+            {'name': '', 'edition': -1, 'publication_year': 2020, 'authors': [str(uuid.uuid4())]},
+        ]
+
+        books_count_before = self.books.count()
+
+        response = self.create(new_books)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertCountEqual(response.data[1].keys(), ['name', 'edition', 'authors'])
+        self.assertEqual(self.books.count(), books_count_before)
+
+    def test_bulk_partial_update(self):
+        books = list(self.books[:2])
+        author = self.authors.first()
+        payload = [
+            {'id': str(books[0].id), 'name': 'Bulk Updated Book'},
+            {'id': str(books[1].id), 'edition': 10, 'authors': [str(author.id)]},
+        ]
+
+        response = self.bulk_partial_update(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        first_book = self.books.get(pk=books[0].id)
+        self.assertEqual(first_book.name, 'Bulk Updated Book')
+        self.assertEqual(first_book.edition, books[0].edition)
+        self.assertGreater(first_book.updated_at, books[0].updated_at)
+
+        second_book = self.books.get(pk=books[1].id)
+        self.assertEqual(second_book.publication_year, books[1].publication_year)
+        self.assertEqual(second_book.edition, 10)
+        self.assertListEqual(list(second_book.authors.all()), [author])
+
+        self.assertListEqual(response.data, [self.book_to_json(first_book), self.book_to_json(second_book)])
+
+    def test_bulk_partial_update_invalid(self):
+        book = self.books.first()
+        payload = [
+            {'id': str(book.id), 'name': 'Bulk Updated Book'},
+            {'id': str(uuid.uuid4()), 'name': 'Nonexistent Book'},
+            {'id': str(book.id), 'edition': 0},
+            {'name': 'Without id'},
+        ]
+
+        response = self.bulk_partial_update(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertCountEqual(response.data[1].keys(), ['id'])
+        self.assertCountEqual(response.data[2].keys(), ['id', 'edition'])
+        self.assertCountEqual(response.data[3].keys(), ['id'])
+        self.assertEqual(self.books.get(pk=book.id).name, book.name)
+
+    def test_bulk_writes_reject_an_empty_list(self):
+        version = response_cache.get_version(response_cache.BOOKS_RESOURCE)
+
+        for write in [self.create, self.bulk_partial_update, self.bulk_delete]:
+            with self.subTest(write=write.__name__):
+                response = write([])
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('non_field_errors', response.data)
+
+        self.assertEqual(response_cache.get_version(response_cache.BOOKS_RESOURCE), version)
+
+    def test_bulk_delete(self):
+        books_ids = [str(book.id) for book in self.books[:2]]
+        books_count_before = self.books.count()
+
+        response = self.bulk_delete(books_ids)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.books.count(), books_count_before - len(books_ids))
+        self.assertFalse(self.books.filter(pk__in=books_ids).exists())
+
+    def test_bulk_delete_updates_book_counts(self):
+        author = self.authors.filter(book_count__gt=1).first()
+        books_ids = [str(book.id) for book in author.books.all()]
+
+        # Validating the ids, fetching the books with their authors, deleting them and recounting their authors once
+        with self.assertMaxQueries(6):
+            response = self.bulk_delete(books_ids)
+
+        author.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(author.book_count, 0)
+
+    def test_bulk_delete_invalid(self):
+        books_count_before = self.books.count()
+        payloads = [
+            [str(self.books.first().id), str(uuid.uuid4())],
+            [],
+            {'id': str(self.books.first().id)},
+        ]
+
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                response = self.bulk_delete(payload)
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(self.books.count(), books_count_before)
@@ -0,0 +1,82 @@
+import itertools
+import secrets
+import time
+import uuid
+from typing import Iterable, Iterator, List, Optional
+
+from django.core.management.base import CommandError
+
+
+def batched(iterable: Iterable, size: Optional[int]) -> Iterator[List]:
+    """
+    Lazily split the iterable in lists of 'size' items (the last one may be smaller). If 'size' is None, all the
+    items are returned in a single list.
+    """
+    iterator = iter(iterable)
+
+    while True:
+        batch = list(itertools.islice(iterator, size))
+
+        if not batch:
+            return
+
+        yield batch
+
+
+def grouped(iterable: Iterable, size: Optional[int]) -> Iterator[Iterator]:
+    """
+    Lazily split the iterable in groups of 'size' items without holding the groups in memory. Each group must be
+    consumed before asking for the next one. If 'size' is None, all the items are returned in a single group.
+    """
+    iterator = iter(iterable)
+    remaining_size = None if size is None else size - 1
+
+    for first_item in iterator:
+        yield itertools.chain([first_item], itertools.islice(iterator, remaining_size))
+
+
+def validate_positive_option(option_name: str, value: Optional[int]) -> Optional[int]:
+    """
+    Return the value of a management command option that must be a positive integer when it is given.
+    """
+    if value is not None and value < 1:
+        raise CommandError(f'{option_name} must be a positive integer.')
+
+    return value
+
+
+def validate_non_negative_option(option_name: str, value: Optional[int]) -> Optional[int]:
+    """
+    Return the value of a management command option that must not be a negative integer when it is given.
+    """
+    if value is not None and value < 0:
+        raise CommandError(f'{option_name} must not be negative.')
+
+    return value
+
+
+def parse_uuid(value) -> Optional[uuid.UUID]:
+    """
+    Return the UUID represented by the value, or None if it is not a valid UUID.
+    """
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def uuid7(timestamp_ms: Optional[int] = None) -> uuid.UUID:
+    """
+    Time-ordered UUID (version 7 of RFC 9562): the 48 most significant bits are the Unix time in milliseconds
+    ('timestamp_ms', by default the current time) and the other ones are the version, the variant and random bits, so
+    the UUIDs generated in later milliseconds sort after the earlier ones.
+    """
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1000000
+
+    value = (timestamp_ms & 0xffffffffffff) << 80 | secrets.randbits(80)
+    # Version 7 in the 4 bits after the timestamp and variant 0b10 in the 2 most significant bits of the 9th byte
+    value = value & ~(0xf << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+
+    return uuid.UUID(int=value)
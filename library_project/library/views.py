@@ -1,24 +1,91 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
+from rest_framework.response import Response
 
-from .filters import AuthorFilter, BookFilter
+from .cache import AUTHORS_RESOURCE, BOOKS_RESOURCE, CachedResponseMixin
+from .conditional import ConditionalGetMixin
+from .export import AUTHORS_CSV_SEPARATOR, ExportMixin
+from .filters import AuthorFilter, BookFilter, OrderingFilterWithAliases
 from .models import Author, Book
-from .serializers import AuthorSerializer, BookSerializer
+from .pagination import PageNumberOrKeysetPagination
+from .serializers import AuthorSerializer, BookReadSerializer, BookSerializer, validate_books_ids
+from .sparse import SparseFieldsFilter, SparseFieldsMixin
 
 
-class AuthorViewSet(viewsets.ReadOnlyModelViewSet):
+class AuthorViewSet(
+    CachedResponseMixin, ConditionalGetMixin, ExportMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    pagination_class = PageNumberOrKeysetPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, SparseFieldsFilter]
     filterset_class = AuthorFilter
-    ordering_fields = ['name']
+    ordering_fields = ['name', 'book_count']
     ordering = 'name'
+    cache_resource = AUTHORS_RESOURCE
+    export_csv_fields = ['id', 'name', 'book_count']
 
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(CachedResponseMixin, ConditionalGetMixin, ExportMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Book.objects.all().prefetch_related('authors')
     serializer_class = BookSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    pagination_class = PageNumberOrKeysetPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilterWithAliases, SparseFieldsFilter]
     filterset_class = BookFilter
     ordering_fields = ['name', 'edition', 'publication_year', 'authors__name']
+    ordering_field_aliases = {'authors__name': 'primary_author_sort'}
     ordering = 'name'
+    cache_resource = BOOKS_RESOURCE
+    export_csv_fields = ['id', 'name', 'edition', 'publication_year', 'authors']
+    related_ids_fields = ['authors']
+
+    read_actions = ['list', 'retrieve', 'export']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action in self.read_actions:
+            # The keyset pagination reads the ordering fields from the rows
+            values_fields = [*BookReadSerializer.values_fields, *self.ordering_field_aliases.values()]
+
+            return queryset.prefetch_related(None).values(*values_fields)
+
+        return queryset
+
+    def get_serializer_class(self):
+        # The schema generator needs the fields of the model serializer
+        if self.action in self.read_actions and not getattr(self, 'swagger_fake_view', False):
+            return BookReadSerializer
+
+        return super().get_serializer_class()
+
+    def get_export_csv_row(self, book):
+        # The authors column has the format read by the import_books command
+        authors = AUTHORS_CSV_SEPARATOR.join(author['name'] for author in book['authors'])
+
+        return [*super().get_export_csv_row(book)[:-1], authors]
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def bulk_partial_update(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_queryset(), data=request.data, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data)
+
+    def bulk_destroy(self, request, *args, **kwargs):
+        books = validate_books_ids(self.get_queryset(), request.data)
+
+        # The queryset prefetches the authors, so the book counts of all their authors are recomputed at once
+        self.get_queryset().filter(pk__in=[book.pk for book in books]).delete()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
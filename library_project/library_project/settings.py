@@ -27,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'library.middleware.MetricsMiddleware',
+    'library.middleware.QueryStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,6 +65,31 @@ DATABASES = {
 }
 DATABASES['default']['CONN_MAX_AGE'] = None  # always connected
 
+# Cache
+# The local-memory cache is per process: use a shared backend (e.g. memcached or database) to invalidate the API
+# responses across all the worker processes.
+LOCMEM_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+CACHE_BACKEND = config('CACHE_BACKEND', default=LOCMEM_CACHE_BACKEND)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default='library'),
+    }
+}
+
+# Generate time-ordered (UUIDv7) primary keys for the new authors and books instead of random (UUIDv4) ones. The ids
+# of the existing rows are not changed.
+TIME_ORDERED_IDS = config('TIME_ORDERED_IDS', default=False, cast=config.boolean)
+
+# Seconds the list and retrieve responses of the API are cached. 0 disables the cache. It is disabled by default with
+# the local-memory cache, since a write only invalidates the responses cached by the process that handled it and the
+# other workers would keep serving stale ones.
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=0 if CACHE_BACKEND == LOCMEM_CACHE_BACKEND else 60, cast=int)
+
+# Expose the number of SQL queries and the database time of each request as the X-DB-Query-Count and X-DB-Time
+# response headers and log fields.
+SQL_INSTRUMENTATION = config('SQL_INSTRUMENTATION', default=False, cast=config.boolean)
+
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
 
@@ -2,8 +2,9 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
-from rest_framework import routers
 
+from library.metrics import metrics_view
+from library.routers import BulkRouter
 from library.views import AuthorViewSet, BookViewSet
 
 schema_view = get_schema_view(
@@ -15,12 +16,13 @@ schema_view = get_schema_view(
     public=True,
 )
 
-router = routers.DefaultRouter()
-router.register(r'api/authors', AuthorViewSet)
-router.register(r'api/books', BookViewSet)
+router = BulkRouter()
+router.register(r'api/authors', AuthorViewSet, basename='authors')
+router.register(r'api/books', BookViewSet, basename='books')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('admin/', admin.site.urls),
     path('docs/', schema_view.with_ui(cache_timeout=0)),
+    path('metrics', metrics_view, name='metrics'),
 ]